@@ -0,0 +1,75 @@
+# Hysteresis + refractory state machine shared by EventBinding and Gate
+import numpy as np
+
+from src.jit import HAS_NUMBA, njit, prange
+
+
+@njit('Tuple((b1, i8))(f8, b1, i8, i8, f8, f8, i8, f8, b1)', cache=True, fastmath=True)
+def step(v, prev_state, t_last, now_ns, trigger_signed, release_signed, refractory, op_sign, hold_release):
+	"""
+	One update of a thresholded on/off state.
+	op_sign: +1.0 for '>' (on above trigger, off below release), -1.0 for '<'.
+	trigger_signed/release_signed: the thresholds pre-multiplied by op_sign,
+	so both ops reduce to v * op_sign > trigger_signed.
+	hold_release: if True a release waits out the refractory time (gates);
+	otherwise it happens immediately and only restarts the timer once the
+	refractory time has passed (event bindings).
+	Returns (new_state, new_t_last).
+	"""
+	elapsed_ok = (now_ns - t_last) > refractory
+	sv = v * op_sign
+	# Straight-line form: rise/fall are the timed transitions, below a pending release
+	rise = (not prev_state) & (sv > trigger_signed) & elapsed_ok
+	below = prev_state & (sv < release_signed)
+	fall = below & elapsed_ok
+	new_state = rise | (prev_state & (not below)) | (below & (not elapsed_ok) & hold_release)
+	new_t_last = now_ns if (rise | fall) else t_last
+	return new_state, new_t_last
+
+
+# Compile/load from cache at import rather than on the first frame
+step(0.0, False, 0, 0, 0.5, 0.45, 120_000_000, 1.0, True)
+
+
+# SoA arrays are float32 (values, thresholds, op sign); state is bool, times are int64 ns
+@njit('void(f4[:], b1[:], f4[:], f4[:], i8[:], f4[:], b1[:], i8[:], i8, b1[:], i1[:])',
+	  parallel=True, cache=True)
+def _batch_step_jit(values, gates_open, trigger_signed, release_signed, refractory, op_sign,
+					prev_state, t_last, now_ns, new_state, edge):
+	for i in prange(values.shape[0]):
+		prev = prev_state[i]
+		state = False
+		# Gate closed or feature lost (NaN): treated as released
+		if gates_open[i] and not np.isnan(values[i]):
+			state, t_last[i] = step(values[i], prev, t_last[i], now_ns,
+									trigger_signed[i], release_signed[i], refractory[i], op_sign[i], False)
+		new_state[i] = state
+		edge[i] = np.int8(state) - np.int8(prev)
+		prev_state[i] = state
+
+
+def _batch_step_numpy(values, gates_open, trigger_signed, release_signed, refractory, op_sign,
+					  prev_state, t_last, now_ns, new_state, edge):
+	valid = gates_open & ~np.isnan(values)
+	signed = values * op_sign
+	with np.errstate(invalid='ignore'):
+		desired = signed > trigger_signed
+		release_ok = signed < release_signed
+	elapsed_ok = (now_ns - t_last) > refractory
+	rise = valid & ~prev_state & desired & elapsed_ok
+	stay = valid & prev_state & ~release_ok
+	fall_timed = valid & prev_state & release_ok & elapsed_ok
+	np.logical_or(rise, stay, out=new_state)
+	t_last[rise | fall_timed] = now_ns
+	np.subtract(new_state, prev_state, out=edge, dtype=np.int8)
+	prev_state[:] = new_state
+
+
+# batch_step: the event-binding step over arrays of bindings, updating
+# prev_state/t_last in place and writing new_state and edge (+1 down, -1 up, 0 none)
+batch_step = _batch_step_jit if HAS_NUMBA else _batch_step_numpy
+_n = np.zeros(1, dtype=bool)
+batch_step(np.zeros(1, dtype=np.float32), np.ones(1, dtype=bool), np.full(1, 0.5, dtype=np.float32),
+		   np.full(1, 0.45, dtype=np.float32), np.full(1, 120, dtype=np.int64), np.ones(1, dtype=np.float32),
+		   np.zeros(1, dtype=bool), np.zeros(1, dtype=np.int64), 0, _n, np.zeros(1, dtype=np.int8))
+del _n
@@ -1,6 +1,13 @@
 
 from __future__ import annotations
+import time
+from functools import partial
 from typing import TYPE_CHECKING, List
+
+import numpy as np
+
+from src.binding._hysteresis import batch_step, step
+from src.gate.gate import ALWAYS_OPEN_GATE
 if TYPE_CHECKING:
 	from src.outputs.actuators import Actuator, EventActuator, DeltaActuator, AbsActuator
 	from src.gate.gate import Gate
@@ -8,9 +15,20 @@ if TYPE_CHECKING:
 
 # --- Binding base classes ---
 class Binding:
+	__slots__ = ('feature', 'gates', '_gate_state', 'actuator', 'id', '_last_state', '_last_value', '_last_time')
+
 	def __init__(self, feature: 'Feature', gates: List['Gate'] | 'Gate', actuator: 'Actuator', id=None):
 		self.feature = feature
-		self.gates = gates if isinstance (gates, list) else [gates]
+		if gates is None:
+			gates = []
+		self.gates = [gate for gate in (gates if isinstance(gates, list) else [gates]) if gate is not ALWAYS_OPEN_GATE]
+		# Resolve how the gate state is read once: no gate, a single gate, or all of several
+		if not self.gates:
+			self._gate_state = ALWAYS_OPEN_GATE.getState
+		elif len(self.gates) == 1:
+			self._gate_state = self.gates[0].getState
+		else:
+			self._gate_state = self._all_gates_state
 		self.actuator = actuator
 		self.id = id
 		self._last_state = None
@@ -26,81 +44,97 @@ class Binding:
 			'binding_value': self._last_value,
 			'binding_time': self._last_time
 		}
-	def get_gate_state(self, left_hand, right_hand):
-		gate_states = [gate.getState(left_hand, right_hand) for gate in self.gates]
+	def get_gate_state(self, left_hand, right_hand, now_ns=None):
+		return self._gate_state(left_hand, right_hand, now_ns)
+
+	def _all_gates_state(self, left_hand, right_hand, now_ns=None):
+		# Every gate is updated each frame (no short-circuit) so their hysteresis stays current
+		gate_states = [gate.getState(left_hand, right_hand, now_ns) for gate in self.gates]
 		for state in gate_states:
 			if not state:
 				return False
 		return True
 
-	def update(self, left_hand, right_hand):
+	def update(self, left_hand, right_hand, now_ns=None):
 		raise NotImplementedError
 
 class EventBinding(Binding):
+	__slots__ = ('event_type', 'prev_state', '_last_transition_time', 'trigger_pct', 'release_pct',
+				 'refractory_ms', 'refractory_ns', 'op', '_op_sign', '_trigger_signed', '_release_signed',
+				 '_batch', '_slot', '_trigger_down', '_trigger_up')
+
 	def __init__(self, feature: 'Feature', gates: List[Gate], actuator, event_type=None, id=None,
 				 trigger_pct=None, release_pct=None, refractory_ms=None, op=None):
 		super().__init__(feature, gates, actuator, id=id)
 		self.event_type = event_type  # e.g., 'down', 'up', etc.
 		self.prev_state = False
 		self._last_transition_time = 0
-		self._custom_trigger_pct = trigger_pct
-		self._custom_release_pct = release_pct
-		self._custom_refractory_ms = refractory_ms
-		self._custom_op = op
+		# Use only config or defaults for thresholds and op
+		self.trigger_pct = float(trigger_pct) if trigger_pct is not None else 0.5
+		self.release_pct = float(release_pct) if release_pct is not None else 0.45
+		self.refractory_ms = int(refractory_ms) if refractory_ms is not None else 120
+		self.refractory_ns = self.refractory_ms * 1_000_000
+		self.op = op if op is not None else '>'
+		self._op_sign = 1.0 if self.op == '>' else -1.0
+		self._trigger_signed = self.trigger_pct * self._op_sign
+		self._release_signed = self.release_pct * self._op_sign
+		# Set when the binding is evaluated in a BindingIndex batch (see BindingIndex.update)
+		self._batch = None
+		self._slot = None
+		# Edge callbacks bound once: pairs take 'down'/'up', plain event actuators fire on down only
+		trigger = getattr(actuator, 'trigger', None)
+		if hasattr(actuator, 'trigger_actuator') or hasattr(actuator, 'release_actuator'):
+			self._trigger_down = partial(trigger, 'down')
+			self._trigger_up = partial(trigger, 'up')
+		else:
+			self._trigger_down = trigger
+			self._trigger_up = None
 
-	def update(self, left_hand, right_hand):
-		import time
-		now_ms = int(time.time() * 1000)
+	def probe_last(self):
+		if self._batch is not None:
+			self._batch._sync_event_binding(self._slot)
+		return super().probe_last()
+
+	def _fire_edge(self, down):
+		fire = self._trigger_down if down else self._trigger_up
+		if fire is not None:
+			fire()
+
+	def update(self, left_hand, right_hand, now_ns=None):
+		if now_ns is None:
+			now_ns = time.monotonic_ns()
 		value = self.feature.getValue(left_hand, right_hand) if self.feature else None
-		gate_state = self.get_gate_state(left_hand, right_hand)
-		# Use only config or defaults for thresholds and op
-		trigger_pct = self._custom_trigger_pct if self._custom_trigger_pct is not None else 0.5
-		release_pct = self._custom_release_pct if self._custom_release_pct is not None else 0.45
-		refractory_ms = self._custom_refractory_ms if self._custom_refractory_ms is not None else 120
-		op = self._custom_op if self._custom_op is not None else '>'
+		gate_state = self.get_gate_state(left_hand, right_hand, now_ns)
 		now_state = False
-		if gate_state:
-			if value is not None:
-				v = float(value)
-				if not self.prev_state:
-					desired = (v > trigger_pct) if op == '>' else (v < trigger_pct)
-					if desired and (now_ms - self._last_transition_time) > refractory_ms:
-						now_state = True
-						self._last_transition_time = now_ms
-				else:
-					release_ok = (v < release_pct) if op == '>' else (v > release_pct)
-					if not release_ok:
-						now_state = True
-					else:
-						if (now_ms - self._last_transition_time) > refractory_ms:
-							now_state = False
-							self._last_transition_time = now_ms
-			# else: feature lost, treat as released
-		# else: gate is False, treat as lost hand (released)
+		if gate_state and value is not None:
+			now_state, self._last_transition_time = step(
+				float(value), self.prev_state, self._last_transition_time, now_ns,
+				self._trigger_signed, self._release_signed, self.refractory_ns,
+				self._op_sign, False)
+		# else: feature lost or gate is False, treat as lost hand (released)
 		self._last_state = now_state
 		self._last_value = value
 		self._last_time = None
 		if now_state and not self.prev_state:
-			if hasattr(self.actuator, 'trigger_actuator') or hasattr(self.actuator, 'release_actuator'):
-				self.actuator.trigger('down')
-			else:
-				self.actuator.trigger()
+			self._fire_edge(True)
 			self._last_time = 'down'
 		elif not now_state and self.prev_state:
-			if hasattr(self.actuator, 'trigger_actuator') or hasattr(self.actuator, 'release_actuator'):
-				self.actuator.trigger('up')
+			self._fire_edge(False)
 			self._last_time = 'up'
 		self.prev_state = now_state
 
 class DeltaBinding(Binding):
+	__slots__ = ('scale', 'deadzone', '_trigger')
+
 	def __init__(self, feature: 'Feature', gate: 'Gate', actuator: 'DeltaActuator', scale=1.0, deadzone=0.0, id=None):
 		super().__init__(feature, gate, actuator, id=id)
 		self.scale = scale
 		self.deadzone = deadzone
+		self._trigger = actuator.trigger
 
-	def update(self, left_hand, right_hand):
+	def update(self, left_hand, right_hand, now_ns=None):
 		value = self.feature.getValue(left_hand, right_hand)
-		gate_state = self.get_gate_state(left_hand, right_hand)
+		gate_state = self.get_gate_state(left_hand, right_hand, now_ns)
 		if not gate_state:
 			self._last_state = False
 			self._last_value = None
@@ -111,30 +145,31 @@ class DeltaBinding(Binding):
 			return
 		if abs(value) > self.deadzone:
 			delta = value * self.scale
-			self.actuator.trigger(delta)
+			self._trigger(delta)
 			self._last_value = delta
 		self._last_state = True
 
 class AbsBinding(Binding):
+	__slots__ = ('min_value', 'max_value', '_offset', '_scale', '_trigger')
+
 	def __init__(self, feature: 'Feature', gate: 'Gate', actuator: 'AbsActuator', min_value=0.0, max_value=1.0, id=None):
 		super().__init__(feature, gate, actuator, id=id)
 		self.min_value = min_value
 		self.max_value = max_value
+		# Affine map value -> offset + scale * value
+		self._offset = min_value
+		self._scale = max_value - min_value
+		self._trigger = actuator.trigger
 
-	def update(self, left_hand, right_hand):
-		gate_state = self.get_gate_state(left_hand, right_hand)
-		if not gate_state:
-			self._last_state = False
-			self._last_value = None
-			return
-		value = self.feature.getValue(left_hand, right_hand)
+	def update(self, left_hand, right_hand, now_ns=None):
+		gate_state = self.get_gate_state(left_hand, right_hand, now_ns)
+		value = self.feature.getValue(left_hand, right_hand) if gate_state else None
+		self._last_state = gate_state
 		if value is None:
-			self._last_state = True
 			self._last_value = None
 			return
-		scaled = self.min_value + (self.max_value - self.min_value) * value
-		self.actuator.trigger(scaled)
-		self._last_state = True
+		scaled = self._offset + self._scale * value
+		self._trigger(scaled)
 		self._last_value = scaled
 
 # --- BindingBuilder ---
@@ -209,12 +244,110 @@ class BindingBuilder:
 # --- BindingIndex ---
 class BindingIndex:
 	def __init__(self, config, feature_index, actuator_builder, gate_builder):
+		self.feature_index = feature_index
 		self.bindings = []
 		bindings_cfg = config.get('bindings', [])
 		for binding_cfg in bindings_cfg:
 			binding = BindingBuilder.build(binding_cfg, feature_index, actuator_builder, gate_builder)
 			self.bindings.append(binding)
 
+		# Bucket by kind; event bindings are evaluated together as float32 arrays (structure of arrays)
+		self._event_bindings = [b for b in self.bindings if isinstance(b, EventBinding)]
+		self._delta_bindings = [b for b in self.bindings if isinstance(b, DeltaBinding)]
+		self._abs_bindings = [b for b in self.bindings if isinstance(b, AbsBinding)]
+		self._other_bindings = [b for b in self.bindings
+								if not isinstance(b, (EventBinding, DeltaBinding, AbsBinding))]
+		# Actuators fire in config order: non-event bindings update in place, event
+		# bindings (evaluated in the batch first) dispatch their edge at their position
+		self._non_event_bindings = [b for b in self.bindings if not isinstance(b, EventBinding)]
+		slots = {id(b): i for i, b in enumerate(self._event_bindings)}
+		self._ordered = [(b, slots.get(id(b))) for b in self.bindings]
+
+		events = self._event_bindings
+		n = len(events)
+		self._ev_features = [b.feature for b in events]
+		self._ev_trigger = np.array([b._trigger_signed for b in events], dtype=np.float32)
+		self._ev_release = np.array([b._release_signed for b in events], dtype=np.float32)
+		self._ev_refractory = np.array([b.refractory_ns for b in events], dtype=np.int64)
+		self._ev_op_sign = np.array([b._op_sign for b in events], dtype=np.float32)
+		self._ev_prev_state = np.zeros(n, dtype=bool)
+		self._ev_t_last = np.zeros(n, dtype=np.int64)
+		self._ev_values = np.full(n, np.nan, dtype=np.float32)
+		self._ev_new_state = np.zeros(n, dtype=bool)
+		self._ev_edge = np.zeros(n, dtype=np.int8)  # +1 down, -1 up, 0 none (last frame)
+		for i, b in enumerate(events):
+			b._batch = self
+			b._slot = i
+
+		# With no hand in view every feature is None, so after one such update (which
+		# releases events and resets movement baselines) further ones change nothing and
+		# are skipped. Not when a 'toggle' lost-hand gate keeps flipping while hands are
+		# away, or for binding types whose no-hand behaviour isn't known here.
+		self._idle_skippable = not self._other_bindings and not any(
+			getattr(gate, 'lost_hand_policy', None) == 'toggle'
+			for b in self.bindings for gate in b.gates)
+		self._idle = False
+
+		# Features the bindings and their gates read, evaluated once per frame in the
+		# FeatureIndex's fixed order. AbsBinding features are left out: they are only read
+		# while the gate is open.
+		used = [b.feature for b in self.bindings if not isinstance(b, AbsBinding)]
+		used += [getattr(gate, 'input_feature', None) for b in self.bindings for gate in b.gates]
+		self._feature_order = feature_index.evaluation_order(used)
+
+	def _sync_event_binding(self, i):
+		# Copy the batched state of event binding i back onto the binding (for probe_last)
+		b = self._event_bindings[i]
+		state = bool(self._ev_prev_state[i])
+		v = self._ev_values[i]
+		edge = self._ev_edge[i]
+		b.prev_state = state
+		b._last_transition_time = int(self._ev_t_last[i])
+		b._last_state = state
+		b._last_value = None if np.isnan(v) else float(v)
+		b._last_time = 'down' if edge > 0 else 'up' if edge < 0 else None
+
+	def _update_events(self, left_hand, right_hand, now_ns):
+		# Steps all event bindings; returns True if any of them has an edge to dispatch
+		events = self._event_bindings
+		n = len(events)
+		if not n:
+			return False
+		# Values from this frame's FeatureIndex.evaluate pass
+		values = np.fromiter(
+			(np.nan if f is None or f._last_value is None else f._last_value for f in self._ev_features),
+			dtype=np.float32, count=n)
+		gates_open = np.fromiter((b.get_gate_state(left_hand, right_hand, now_ns) for b in events),
+								 dtype=bool, count=n)
+		new_state = self._ev_new_state
+		edge = self._ev_edge
+		batch_step(values, gates_open, self._ev_trigger, self._ev_release, self._ev_refractory,
+				   self._ev_op_sign, self._ev_prev_state, self._ev_t_last, now_ns, new_state, edge)
+		self._ev_values = values
+		return bool(edge.any())
+
 	def update(self, left_hand, right_hand):
-		for binding in self.bindings:
-			binding.update(left_hand, right_hand)
\ No newline at end of file
+		if left_hand is None and right_hand is None:
+			if self._idle:
+				return
+			self._idle = self._idle_skippable
+		else:
+			self._idle = False
+		# One monotonic ns tick per frame, shared by every binding and gate
+		now_ns = time.monotonic_ns()
+		# New frame: features recompute shared hand geometry once
+		self.feature_index.begin_frame()
+		self.feature_index.evaluate(left_hand, right_hand, self._feature_order)
+		# Feature values and gates don't depend on actuator output, so stepping the
+		# event batch before the other bindings leaves only the dispatch order to keep
+		if not self._update_events(left_hand, right_hand, now_ns):
+			for binding in self._non_event_bindings:
+				binding.update(left_hand, right_hand, now_ns)
+			return
+		edges = self._ev_edge.tolist()
+		for binding, slot in self._ordered:
+			if slot is None:
+				binding.update(left_hand, right_hand, now_ns)
+			elif edges[slot]:
+				binding.prev_state = edges[slot] > 0
+				binding._fire_edge(edges[slot] > 0)
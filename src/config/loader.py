@@ -1,26 +1,42 @@
+import os, sys, re, json, copy, functools, platform, threading, time, types
+from collections import OrderedDict
+from typing import Dict, Any, Tuple
 
+# YAML libraries are imported lazily, on first read/write of a config file
+_UNSET = object()
+_ruamel_yaml_cls = _UNSET
+_pyyaml_mod = _UNSET
 
-import os, sys, json
-from typing import Dict, Any
-
-# Try ruamel.yaml for comment/format preserving round-trip
-try:
-	from ruamel.yaml import YAML  # type: ignore
-	_HAS_RUAMEL = True
-except Exception:
-	YAML = None  # type: ignore
-	_HAS_RUAMEL = False
+def _ruamel_yaml():
+	# ruamel.yaml for comment/format preserving round-trip; None if not installed
+	global _ruamel_yaml_cls
+	if _ruamel_yaml_cls is _UNSET:
+		try:
+			from ruamel.yaml import YAML  # type: ignore
+			_ruamel_yaml_cls = YAML
+		except Exception:
+			_ruamel_yaml_cls = None
+	return _ruamel_yaml_cls
 
-# Fallback: PyYAML
-try:
-	import yaml  # type: ignore
-except Exception:
-	yaml = None  # type: ignore
+def _yaml():
+	# Fallback: PyYAML; None if not installed
+	global _pyyaml_mod
+	if _pyyaml_mod is _UNSET:
+		try:
+			import yaml  # type: ignore
+			_pyyaml_mod = yaml
+		except Exception:
+			_pyyaml_mod = None
+	return _pyyaml_mod
 
 HERE = os.path.dirname(os.path.abspath(__file__))
 ROOT = os.path.abspath(os.path.join(HERE, "..", ".."))
 DEFAULT_CONFIG_PATH = os.path.join(ROOT, "configs", "config.yaml")
 
+# Parsed configs keyed by absolute path, validated against (mtime_ns, size); LRU-bounded
+_yaml_cache: "OrderedDict[str, Tuple[int, int, Dict[str, Any]]]" = OrderedDict()
+_CACHE_MAX = 100
+
 def minimal_default_config() -> Dict[str, Any]:
 	return {
 		"version": 1,
@@ -77,7 +93,14 @@ def minimal_default_config() -> Dict[str, Any]:
 def write_yaml(path: str, data: Dict[str, Any]) -> None:
 	os.makedirs(os.path.dirname(path), exist_ok=True)
 	# If ruamel.yaml is available, use it (preserves comments/formatting on round-tripped data)
-	if _HAS_RUAMEL and YAML is not None:
+	YAML = _ruamel_yaml()
+	if YAML is not None:
+		if not hasattr(data, "ca") and os.path.exists(path):
+			# Plain dict (e.g. from the resolved JSON cache): merge into the round-trip
+			# document on disk so its comments and formatting survive the rewrite
+			doc = load_yaml(path)
+			if isinstance(doc, dict):
+				data = _merge_into(doc, data)
 		y = YAML()
 		y.preserve_quotes = True
 		y.indent(mapping=2, sequence=2, offset=0)
@@ -85,12 +108,30 @@ def write_yaml(path: str, data: Dict[str, Any]) -> None:
 			y.dump(data, f)
 		return
 	# Fallbacks
+	yaml = _yaml()
 	with open(path, "w", encoding="utf-8") as f:
 		if yaml:
 			yaml.safe_dump(data, f, sort_keys=False)
 		else:
 			f.write(json.dumps(data, indent=2))
 
+def _merge_into(doc, data):
+	# Update doc in place to equal data, keeping doc's container objects where shapes match
+	if isinstance(doc, dict) and isinstance(data, dict):
+		for k in [k for k in doc if k not in data]:
+			del doc[k]
+		for k, v in data.items():
+			if k in doc:
+				doc[k] = _merge_into(doc[k], v)
+			else:
+				doc[k] = v
+		return doc
+	if isinstance(doc, list) and isinstance(data, list) and len(doc) == len(data):
+		for i, v in enumerate(data):
+			doc[i] = _merge_into(doc[i], v)
+		return doc
+	return data
+
 def load_yaml(path: str) -> Dict[str, Any]:
 	if not os.path.exists(path):
 		print(f"[info] Config not found at {path}. Creating a minimal default.")
@@ -98,39 +139,123 @@ def load_yaml(path: str) -> Dict[str, Any]:
 		data = minimal_default_config()
 		write_yaml(path, data)
 		return data
+	key = os.path.abspath(path)
+	st = os.stat(key)
+	hit = _yaml_cache.get(key)
+	if hit is not None and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+		_yaml_cache.move_to_end(key)
+		# Callers (ensure_defaults) mutate the result, so never hand out the cached dict
+		return copy.deepcopy(hit[2])
+	data = _parse_yaml(key)
+	_yaml_cache[key] = (st.st_mtime_ns, st.st_size, copy.deepcopy(data))
+	_yaml_cache.move_to_end(key)
+	if len(_yaml_cache) > _CACHE_MAX:
+		_yaml_cache.popitem(last=False)
+	return data
+
+def load_yaml_if_present(path: str):
+	# Like load_yaml but returns None for a missing file instead of creating the default
+	if not os.path.exists(path):
+		return None
+	return load_yaml(path)
+
+def _parse_yaml(path: str) -> Dict[str, Any]:
 	# Prefer ruamel round-trip load to retain comments/formatting
-	if _HAS_RUAMEL and YAML is not None:
+	YAML = _ruamel_yaml()
+	if YAML is not None:
 		y = YAML()
 		y.preserve_quotes = True
 		with open(path, "r", encoding="utf-8") as f:
 			return y.load(f) or {}
+	yaml = _yaml()
 	with open(path, "r", encoding="utf-8") as f:
 		if yaml:
 			return yaml.safe_load(f) or {}
 		return json.loads(f.read())
 
 
-def ensure_defaults(cfg: Dict[str, Any]):
-	# last_camera block
-	cfg.setdefault("last_camera", {"backend": "any", "name": "", "id": "", "index": 0})
-	# smoothing
-	sm = cfg.setdefault("smoothing", {})
-	# Get screen size
-	def get_screen_size():
-		try:
-			import platform
-			if platform.system() == "Windows":
-				import ctypes
-				user32 = ctypes.windll.user32
-				return user32.GetSystemMetrics(0), user32.GetSystemMetrics(1)
-			import tkinter as tk
-			root = tk.Tk(); root.withdraw()
-			w, h = root.winfo_screenwidth(), root.winfo_screenheight()
-			root.destroy()
-			return int(w), int(h)
-		except Exception:
-			return 1920, 1080
+# Windows: resolve user32 once at import instead of per screen-size lookup
+_user32 = None
+if platform.system() == "Windows":
+	try:
+		import ctypes
+		_user32 = ctypes.windll.user32
+	except Exception:
+		_user32 = None
+
+@functools.lru_cache(maxsize=1)
+def get_screen_size():
+	try:
+		if _user32 is not None:
+			return _user32.GetSystemMetrics(0), _user32.GetSystemMetrics(1)
+		import tkinter as tk
+		root = tk.Tk(); root.withdraw()
+		w, h = root.winfo_screenwidth(), root.winfo_screenheight()
+		root.destroy()
+		return int(w), int(h)
+	except Exception:
+		return 1920, 1080
+
+# Default calibration per feature family, first match wins (read-only templates)
+_CALIB_FALLBACK = types.MappingProxyType({"min": 0.0, "max": 1.0})
+_CALIB_DEFAULT_TABLE = (
+	(re.compile(r"\.motion\.up"), types.MappingProxyType({"axis": [0.0, -1.0], "range_norm": 0.20})),
+	(re.compile(r"\.motion\.left"), types.MappingProxyType({"axis": [1.0, 0.0], "range_norm": 0.20})),
+	(re.compile(r"\.pos"), types.MappingProxyType({"quad": [[0,0],[1,0],[1,1],[0,1]]})),
+	(re.compile(r"\.gesture\.(closed|pinch)"), types.MappingProxyType({"min": 0.30, "max": 0.95})),
+	# All curvatures (per-finger, rel, diff) use same min/max
+	(re.compile(r"\.curv\."), types.MappingProxyType({"min": -0.20, "max": 0.50})),
+	(re.compile(r"\.distance(\.|$)"), types.MappingProxyType({"min": 0.10, "max": 0.80})),
+)
+
+@functools.lru_cache(maxsize=256)
+def _calib_template(feat: str) -> types.MappingProxyType:
+	for pattern, template in _CALIB_DEFAULT_TABLE:
+		if pattern.search(feat):
+			return template
+	return _CALIB_FALLBACK
 
+def _canonical_feature_names():
+	# Names registered by FeatureIndex (kept here so the loader does not import cv2/features)
+	fingers = ("index", "middle", "ring", "pinky")
+	tips = ("thumb", "index", "middle", "ring", "pinky")
+	for hand in ("right_hand", "left_hand"):
+		yield f"{hand}.pos"
+		yield f"{hand}.pos.x"
+		yield f"{hand}.pos.y"
+		yield f"{hand}.motion.up"
+		yield f"{hand}.motion.left"
+		for name in fingers + ("thumb",):
+			yield f"{hand}.curv.{name}"
+		for name in fingers:
+			yield f"{hand}.curv.{name}.rel"
+			yield f"{hand}.bend.{name}"
+			yield f"{hand}.bend.{name}.rel"
+		yield f"{hand}.gesture.closed"
+		for i, a in enumerate(tips):
+			for b in tips[i + 1:]:
+				yield f"{hand}.dist.{a}.{b}"
+				yield f"{hand}.dist.{b}.{a}"
+		yield f"{hand}.dist.thumb.hand"
+		yield f"{hand}.dist.hand.thumb"
+		yield f"{hand}.rotation"
+		yield f"{hand}.rotation.roll"
+		yield f"{hand}.rotation.pitch"
+	yield "hands.distance"
+
+# Calibration template per known feature, resolved once at import
+_CANONICAL_CALIB_DEFAULTS = {name: _calib_template(name) for name in _canonical_feature_names()}
+
+def get_calib_default(feat: str) -> dict:
+	# Known features are a dict lookup; the pattern table only runs for custom names
+	template = _CANONICAL_CALIB_DEFAULTS.get(feat)
+	if template is None:
+		template = _calib_template(feat)
+	# Fresh dict per feature: the result is stored in cfg and may be edited by calibration
+	return {k: copy.deepcopy(v) for k, v in template.items()}
+
+
+def ensure_defaults(cfg: Dict[str, Any]):
 	screen_w, screen_h = get_screen_size()
 
 	# last_camera block
@@ -145,30 +270,9 @@ def ensure_defaults(cfg: Dict[str, Any]):
 	calib = cfg.setdefault("calibration", {})
 	# Gather all feature names used in bindings (input and gate.input)
 	outs = cfg.setdefault("bindings", [])
-	used_features = set()
-	for o in outs:
-		if 'input' in o:
-			used_features.add(o['input'])
-		if 'gate' in o and isinstance(o['gate'], dict) and 'input' in o['gate']:
-			used_features.add(o['gate']['input'])
-
-	def get_calib_default(feat: str) -> dict:
-		# Heuristic: use suffixes and patterns
-		if ".motion.up" in feat:
-			return {"axis": [0.0, -1.0], "range_norm": 0.20}
-		if ".motion.left" in feat:
-			return {"axis": [1.0, 0.0], "range_norm": 0.20}
-		if ".pos" in feat:
-			return {"quad": [[0,0],[1,0],[1,1],[0,1]]}
-		if ".gesture.closed" in feat or ".gesture.pinch" in feat:
-			return {"min": 0.30, "max": 0.95}
-		if ".curv." in feat:
-			# All curvatures (per-finger, rel, diff) use same min/max
-			return {"min": -0.20, "max": 0.50}
-		if ".distance." in feat or feat.endswith(".distance"):
-			return {"min": 0.10, "max": 0.80}
-		# fallback
-		return {"min": 0.0, "max": 1.0}
+	used_features = set(o['input'] for o in outs if 'input' in o)
+	used_features.update(o['gate']['input'] for o in outs
+						 if isinstance(o.get('gate'), dict) and 'input' in o['gate'])
 
 	for feat in used_features:
 		# If .pos.x or .pos.y, add .pos calibration instead
@@ -225,3 +329,113 @@ def ensure_defaults(cfg: Dict[str, Any]):
 			g.setdefault("refractory_ms", 120)
 			g.setdefault("lost_hand_policy", "release")
 	return cfg
+
+
+# --- Resolved config cache ---
+# After load_yaml + ensure_defaults the result is stored as JSON next to the YAML file,
+# stamped with everything the result depends on: the YAML (mtime_ns, size), the screen
+# size (screen.width/height sensitivities) and _DEFAULTS_VERSION. The next start skips
+# YAML parsing when the stamp matches.
+_RESOLVED_SUFFIX = ".resolved.json"
+# Bump when ensure_defaults, minimal_default_config or the calibration templates change
+_DEFAULTS_VERSION = 1
+_resolved_clean: Dict[str, str] = {}  # path -> JSON of the config as last loaded/written
+
+def _yaml_stamp(path: str):
+	st = os.stat(path)
+	w, h = get_screen_size()
+	return [st.st_mtime_ns, st.st_size, w, h, _DEFAULTS_VERSION]
+
+def load_config(path: str) -> Dict[str, Any]:
+	"""
+	load_yaml + ensure_defaults, served from the resolved JSON cache when the YAML, the
+	screen size and the defaults version are unchanged.
+	"""
+	key = os.path.abspath(path)
+	if os.path.exists(key):
+		try:
+			with open(key + _RESOLVED_SUFFIX, "r", encoding="utf-8") as f:
+				cached = json.load(f)
+			if cached.get("_yaml_stamp") == _yaml_stamp(key):
+				cfg = cached["config"]
+				_resolved_clean[key] = json.dumps(cfg, sort_keys=True)
+				return cfg
+		except (OSError, ValueError, KeyError, TypeError, AttributeError):
+			pass
+	return ensure_defaults(load_yaml(key))
+
+def write_config(path: str, cfg: Dict[str, Any]) -> None:
+	"""
+	write_yaml for a resolved config; refreshes the JSON cache and skips the write
+	entirely when cfg is unchanged since it was loaded from (or written to) the cache.
+	"""
+	key = os.path.abspath(path)
+	try:
+		dumped = json.dumps(cfg, sort_keys=True)
+	except (TypeError, ValueError):
+		dumped = None
+	if dumped is not None and _resolved_clean.get(key) == dumped:
+		return
+	write_yaml(key, cfg)
+	if dumped is None:
+		return
+	try:
+		with open(key + _RESOLVED_SUFFIX, "w", encoding="utf-8") as f:
+			json.dump({"_yaml_stamp": _yaml_stamp(key), "config": cfg}, f)
+		_resolved_clean[key] = dumped
+	except OSError:
+		pass
+
+
+class DeferredConfigWriter:
+	"""
+	write_config off the caller's thread, debounced: request() marks the config dirty and
+	a daemon thread writes it once no further request came in for delay_s, so a burst of
+	changes (camera switching during a disconnect) costs one write, never a frame stall.
+	flush() writes a pending change immediately (call it on shutdown).
+	"""
+	def __init__(self, path: str, cfg: Dict[str, Any], delay_s: float = 2.0):
+		self.path = path
+		self.cfg = cfg
+		self.delay_s = float(delay_s)
+		self._lock = threading.Lock()
+		self._write_lock = threading.Lock()
+		self._wake = threading.Event()
+		self._dirty = False
+		self._last_request = 0.0
+		self._thread = threading.Thread(target=self._run, name="config-writer", daemon=True)
+		self._thread.start()
+
+	def request(self) -> None:
+		with self._lock:
+			self._dirty = True
+			self._last_request = time.monotonic()
+		self._wake.set()
+
+	def flush(self) -> None:
+		self._write_pending()
+
+	def _write_pending(self) -> None:
+		with self._write_lock:
+			with self._lock:
+				if not self._dirty:
+					return
+				self._dirty = False
+				# Snapshot so the caller can keep mutating cfg while the file is written
+				snapshot = copy.deepcopy(self.cfg)
+			write_config(self.path, snapshot)
+
+	def _run(self) -> None:
+		while True:
+			self._wake.wait()
+			self._wake.clear()
+			while True:
+				with self._lock:
+					remaining = self._last_request + self.delay_s - time.monotonic()
+				if remaining <= 0:
+					break
+				time.sleep(remaining)
+			try:
+				self._write_pending()
+			except Exception as e:
+				print(f"[config] Failed to write {self.path}: {e}")
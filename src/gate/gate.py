@@ -1,12 +1,22 @@
 import time
 
+from src.binding._hysteresis import step
+
 class Gate:
+    __slots__ = ('input_feature', 'op', 'trigger_pct', 'release_pct', 'refractory_ms', 'refractory_ns',
+                 '_op_sign', '_trigger_signed', '_release_signed', 'lost_hand_policy',
+                 'state', 't_last', '_last_value', '_last_tracked', '_last_time')
+
     def __init__(self, input_feature, op=">", trigger_pct=0.5, release_pct=0.45, refractory_ms=120, lost_hand_policy="release"):
         self.input_feature = input_feature  # Feature instance
         self.op = op
-        self.trigger_pct = trigger_pct
-        self.release_pct = release_pct
-        self.refractory_ms = refractory_ms
+        self.trigger_pct = float(trigger_pct)
+        self.release_pct = float(release_pct)
+        self.refractory_ms = int(refractory_ms)
+        self.refractory_ns = self.refractory_ms * 1_000_000
+        self._op_sign = 1.0 if op == ">" else -1.0
+        self._trigger_signed = self.trigger_pct * self._op_sign
+        self._release_signed = self.release_pct * self._op_sign
         self.lost_hand_policy = lost_hand_policy  # 'release'|'hold'|'true'|'toggle'
         self.state = False
         self.t_last = 0
@@ -20,16 +30,18 @@ class Gate:
             'feature': self.input_feature.probe_last_value(),
         }
 
-    def getState(self, hand_left, hand_right):
+    def getState(self, hand_left, hand_right, now_ns=None):
         """
         hand_left, hand_right: HandState or None
+        now_ns: monotonic frame tick in ns (computed here if not given)
         Returns: bool (gate open/closed)
         """
-        now_ms = int(time.time() * 1000)
+        if now_ns is None:
+            now_ns = time.monotonic_ns()
         # Try to get value from input_feature (may use left, right, or both)
         val = None
         try:
-            if hasattr(self.input_feature, 'getValue'):
+            if self.input_feature is not None:
                 val = self.input_feature.getValue(hand_left, hand_right)
         except Exception as e:
             val = None
@@ -37,7 +49,7 @@ class Gate:
         tracked = val is not None
         self._last_value = val
         self._last_tracked = tracked
-        self._last_time = now_ms
+        self._last_time = now_ns
         # Lost hand policy
         if not tracked:
             if self.lost_hand_policy == "hold":
@@ -46,28 +58,32 @@ class Gate:
                 self.state = True
                 return True
             elif self.lost_hand_policy == "toggle":
-                if now_ms - self.t_last > self.refractory_ms:
+                if now_ns - self.t_last > self.refractory_ns:
                     self.state = not self.state
-                    self.t_last = now_ms
+                    self.t_last = now_ns
                 return self.state
             else:  # release
                 self.state = False
                 return False
 
-        v = float(val)
-        desired = (v > self.trigger_pct) if self.op == ">" else (v < self.trigger_pct)
-        release_ok = (v < self.release_pct) if self.op == ">" else (v > self.release_pct)
-
-        if not self.state:
-            if desired and (now_ms - self.t_last) > self.refractory_ms:
-                self.state = True
-                self.t_last = now_ms
-        else:
-            if release_ok and (now_ms - self.t_last) > self.refractory_ms:
-                self.state = False
-                self.t_last = now_ms
+        self.state, self.t_last = step(
+            float(val), self.state, self.t_last, now_ns,
+            self._trigger_signed, self._release_signed, self.refractory_ns,
+            self._op_sign, True)
         return self.state
     
+class _AlwaysOpenGate:
+    # Stand-in for "no gate configured" so callers never need a None check
+    __slots__ = ()
+
+    def getState(self, hand_left, hand_right, now_ns=None):
+        return True
+
+    def probe_last_state(self):
+        return {'state': True, 'feature': None}
+
+ALWAYS_OPEN_GATE = _AlwaysOpenGate()
+
 class GateBuilder:
     def __init__(self, feature_index):
         self.feature_index = feature_index
@@ -75,7 +91,7 @@ class GateBuilder:
     def build(self, gate_cfg):
         # gate_cfg must contain 'input' key specifying the feature name
         if not gate_cfg:
-            return None
+            return ALWAYS_OPEN_GATE
         feature_name = gate_cfg.get('input')
         feature = self.feature_index.getFeature(feature_name)
         return Gate(
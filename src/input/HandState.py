@@ -1,12 +1,15 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Any, List, Tuple
+from dataclasses import dataclass, field
+import math
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
 
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from src.input.tracker import MultiLandmark
 
-@dataclass
+@dataclass(slots=True)
 class HandState:
     WRIST = 0
     THUMB_CMC = 1
@@ -30,7 +33,86 @@ class HandState:
     PINKY_DIP = 19
     PINKY_TIP = 20   
     PALM_CENTER = 21  # Custom extra landmark for palm center
+    # MCP, PIP, DIP, TIP of index, middle, ring, pinky, then CMC, MCP, IP, TIP of the thumb:
+    # the rows of the per-hand batched curvature table
+    FINGER_IDS = tuple((mcp, mcp + 1, mcp + 2, mcp + 3)
+                       for mcp in (INDEX_FINGER_MCP, MIDDLE_FINGER_MCP, RING_FINGER_MCP, PINKY_MCP, THUMB_CMC))
+    # Landmarks averaged into the PALM_CENTER row
+    PALM_CENTER_IDS = (WRIST, INDEX_FINGER_MCP, MIDDLE_FINGER_MCP, RING_FINGER_MCP, PINKY_MCP)
+    # Rows of the per-hand fingertip distance table
+    FINGERTIP_IDS = (THUMB_TIP, INDEX_FINGER_TIP, MIDDLE_FINGER_TIP, RING_FINGER_TIP, PINKY_TIP)
 
     label: str                     # "Left" or "Right"
-    landmarks: List[MultiLandmark]  # List of 21 landmarks + palm center
-    palm_width: float
\ No newline at end of file
+    landmarks: List[MultiLandmark]  # The 21 MediaPipe landmarks; the palm center is only a row of the arrays
+    palm_width: float
+    # Contiguous per-hand landmark arrays (row i = landmark i, 22 rows incl. palm center),
+    # filled once from `landmarks` so features can index/slice instead of chasing objects
+    xyz: Optional[np.ndarray] = field(default=None, compare=False, repr=False)         # (22,3) float32 screen space (sx, sy, sz)
+    nxyz: Optional[np.ndarray] = field(default=None, compare=False, repr=False)        # (22,3) float32 normalized image space (x, y, z)
+    wxyz: Optional[np.ndarray] = field(default=None, compare=False, repr=False)        # (22,3) float32 world space (wx, wy, wz)
+    visibility: Optional[np.ndarray] = field(default=None, compare=False, repr=False)  # (22,) float32, NaN if unknown
+    # Single (3,22,3) float32 buffer backing xyz, nxyz and wxyz (in that order); each is a
+    # contiguous view into it, so one copy moves a whole hand (see HandSmoother)
+    coords: Optional[np.ndarray] = field(default=None, compare=False, repr=False)
+    inv_palm_width: float = field(init=False, compare=False, repr=False)                # 1 / palm_width, for scale-free features
+    # Derived per-hand values, computed on first use (landmarks never change after construction)
+    _curv_cache: Optional[np.ndarray] = field(default=None, init=False, compare=False, repr=False)  # (5,) FINGER_IDS curvatures
+    _bend_cache: Optional[np.ndarray] = field(default=None, init=False, compare=False, repr=False)  # (4,) long-finger bend angles
+    _tip_dist_cache: Optional[np.ndarray] = field(default=None, init=False, compare=False, repr=False)  # (7,7) world distances, see features._DIST_IDS
+    _rel_curv_cache: Optional[np.ndarray] = field(default=None, init=False, compare=False, repr=False)  # (4,) relative curvatures, see features._REL_W
+    _rel_bend_cache: Optional[np.ndarray] = field(default=None, init=False, compare=False, repr=False)  # (4,) relative bend angles
+    _palm_normal: Optional[np.ndarray] = field(default=None, init=False, compare=False, repr=False)
+
+    @property
+    def xy(self) -> np.ndarray:
+        # (22,2) screen-space view for 2D-only features
+        return self.xyz[:, :2]
+
+    @property
+    def palm_center(self) -> np.ndarray:
+        # (3,) screen-space palm center (row PALM_CENTER of xyz)
+        return self.xyz[self.PALM_CENTER]
+
+    @property
+    def palm_normal_u(self) -> np.ndarray:
+        # Unit normal of the palm plane (WRIST, INDEX_FINGER_MCP, MIDDLE_FINGER_MCP) in screen space,
+        # shared by all bend features of this hand
+        n = self._palm_normal
+        if n is None:
+            xyz = self.xyz
+            wx, wy, wz = xyz[self.WRIST].tolist()
+            ix, iy, iz = xyz[self.INDEX_FINGER_MCP].tolist()
+            mx, my, mz = xyz[self.MIDDLE_FINGER_MCP].tolist()
+            ax, ay, az = ix - wx, iy - wy, iz - wz
+            bx, by, bz = mx - wx, my - wy, mz - wz
+            nx, ny, nz = ay * bz - az * by, az * bx - ax * bz, ax * by - ay * bx
+            inv = 1.0 / (math.sqrt(nx * nx + ny * ny + nz * nz) + 1e-9)
+            n = self._palm_normal = np.array((nx * inv, ny * inv, nz * inv))
+        return n
+
+    def __post_init__(self):
+        lms = self.landmarks
+        self.inv_palm_width = 1.0 / max(1e-6, self.palm_width)
+        if self.coords is None:
+            if self.xyz is None:
+                self.xyz = np.array([(lm.sx, lm.sy, lm.sz) for lm in lms], dtype=np.float32)
+            if self.nxyz is None:
+                self.nxyz = np.array([(lm.x, lm.y, lm.z) for lm in lms], dtype=np.float32)
+            if self.wxyz is None:
+                self.wxyz = np.array([(lm.wx, lm.wy, lm.wz) for lm in lms], dtype=np.float32)
+            coords = np.stack((self.xyz, self.nxyz, self.wxyz)).astype(np.float32, copy=False)
+            if coords.shape[1] == self.PALM_CENTER:
+                # Built from the 21 landmark objects: append the palm center row
+                pc = coords[:, self.PALM_CENTER_IDS].mean(axis=1, keepdims=True)
+                coords = np.concatenate((coords, pc), axis=1)
+            self.coords = coords
+        self.xyz, self.nxyz, self.wxyz = self.coords
+        if self.visibility is None:
+            vis = [np.nan if lm.visibility is None else lm.visibility for lm in lms]
+            if len(vis) == self.PALM_CENTER:
+                vis.append(vis[self.WRIST])  # palm center row reports the wrist's visibility
+            self.visibility = np.array(vis, dtype=np.float32)
+        # Validate once here so features can index the arrays without per-call guards
+        n = self.PALM_CENTER + 1
+        if self.coords.shape != (3, n, 3):
+            raise ValueError(f"HandState needs {n} landmarks (incl. palm center), got {self.coords.shape[1]}")
@@ -2,30 +2,180 @@
 from typing import Optional, Dict, Any
 from src.input.HandState import HandState
 import numpy as np
+import functools
 import math
+from math import sqrt
 import cv2
-from src.input.geometry import finger_curvature_3d, finger_bend_plane_angle
+from src.input.geometry import finger_curvature_3d, finger_curvatures_3d, finger_bend_plane_angle, finger_bend_plane_angles
+from src.input.geometry import rotation_angle, roll_angle, UP_VEC, _scale3
 from src.ui.debug_overlay import debug_overlay
 
 
+# Per-hand finger table evaluated in one batched call (see HandState.FINGER_IDS)
+FINGER_IDS = HandState.FINGER_IDS
+FINGER_IDS_NP = np.array(FINGER_IDS, dtype=np.int32)
+_FINGER_ROW = {ids: row for row, ids in enumerate(FINGER_IDS)}
+# Bend rows (MCP -> TIP) of the four long fingers, same order
+_BEND_MCP_NP = np.ascontiguousarray(FINGER_IDS_NP[:4, 0])
+_BEND_PIP_NP = np.ascontiguousarray(FINGER_IDS_NP[:4, 3])
+_BEND_ROW = {(mcp, pip): row for row, (mcp, pip) in enumerate(zip(_BEND_MCP_NP.tolist(), _BEND_PIP_NP.tolist()))}
+
+
+def _hand_curvatures(hand):
+	# (5,) curvatures of the FINGER_IDS rows, computed once and kept on the HandState
+	vals = hand._curv_cache
+	if vals is None:
+		vals = hand._curv_cache = finger_curvatures_3d(hand.xyz, FINGER_IDS_NP)
+	return vals
+
+
+def _hand_bends(hand):
+	# (4,) bend angles of the long fingers, computed once and kept on the HandState
+	vals = hand._bend_cache
+	if vals is None:
+		vals = hand._bend_cache = finger_bend_plane_angles(hand, _BEND_MCP_NP, _BEND_PIP_NP)
+	return vals
+
+# Points of the per-hand distance table: the fingertips plus the thumb.hand pair (THUMB_IP, INDEX_MCP)
+_DIST_IDS = HandState.FINGERTIP_IDS + (HandState.THUMB_IP, HandState.INDEX_FINGER_MCP)
+_DIST_IDS_NP = np.array(_DIST_IDS, dtype=np.int32)
+_DIST_ROW = {lm: row for row, lm in enumerate(_DIST_IDS)}
+
+# Name tables FeatureIndex registers per hand (fixed, so built once at import)
+FINGER_NAMES = tuple(zip(("index", "middle", "ring", "pinky"), FINGER_IDS[:4]))
+THUMB_IDS = FINGER_IDS[4]
+# Neighbours whose mean a relative feature is measured against
+REL_REFS = {
+	"index":  ("middle",),
+	"middle": ("index", "ring"),
+	"ring":   ("middle", "pinky"),
+	"pinky":  ("ring",),
+}
+FINGERTIP_NAMES = tuple(zip(("thumb", "index", "middle", "ring", "pinky"), HandState.FINGERTIP_IDS))
+# (4,4) reference-mean matrix over the long fingers: the relative values of all four
+# are one matmul, rel = vals - _REL_W @ vals (same for the curvature and bend tables)
+def _ref_mean_matrix():
+	rows = {name: row for row, (name, _) in enumerate(FINGER_NAMES)}
+	W = np.zeros((4, 4), dtype=np.float32)
+	for name, refs in REL_REFS.items():
+		W[rows[name], [rows[r] for r in refs]] = 1.0 / len(refs)
+	return W
+_REL_W = _ref_mean_matrix()
+
+
+def _hand_tip_distances(hand):
+	# (7,7) pairwise world-space distances of the _DIST_IDS, computed once and kept on the HandState
+	vals = hand._tip_dist_cache
+	if vals is None:
+		tips = hand.wxyz[_DIST_IDS_NP]
+		diffs = tips[:, None, :] - tips[None, :, :]
+		vals = hand._tip_dist_cache = np.sqrt(np.einsum('ijk,ijk->ij', diffs, diffs))
+	return vals
+
+
+def _hand_relative(hand, kind):
+	# (4,) relative values of the 'curv' or 'bend' table, computed once and kept on the HandState
+	if kind == 'curv':
+		vals = hand._rel_curv_cache
+		if vals is None:
+			curvs = _hand_curvatures(hand)[:4]
+			vals = hand._rel_curv_cache = curvs - _REL_W @ curvs
+	else:
+		vals = hand._rel_bend_cache
+		if vals is None:
+			bends = _hand_bends(hand)
+			vals = hand._rel_bend_cache = bends - _REL_W @ bends
+	return vals
+
+
+def _frame_memo(get_value):
+	# Wraps a Feature.getValue: repeated calls in the same frame with the same hands
+	# (aliased keys, relative features sharing a main feature) return the cached value
+	@functools.wraps(get_value)
+	def getValue(self, left_hand, right_hand):
+		index = self._index
+		if (index is not None and self._last_frame == index._frame
+				and self._last_left is left_hand and self._last_right is right_hand):
+			return self._last_value
+		value = get_value(self, left_hand, right_hand)
+		if index is not None:
+			self._last_frame = index._frame
+			self._last_left = left_hand
+			self._last_right = right_hand
+		return value
+	return getValue
+
+
 class Feature:
+	__slots__ = ('hand', 'calibration', '_is_left', '_last_value', '_last_raw_value', '_min', '_max', '_norm_scale',
+				 '_index', '_last_frame', '_last_left', '_last_right')
+
+	def __init_subclass__(cls, **kwargs):
+		super().__init_subclass__(**kwargs)
+		if 'getValue' in cls.__dict__:
+			cls.getValue = _frame_memo(cls.__dict__['getValue'])
+
 	def normalize_value(self, raw: float) -> float:
 		# Linear normalization: 0 at self.min, 1 at self.max, linear in between, not clamped
-		min_v = getattr(self, 'min', 0.0)
-		max_v = getattr(self, 'max', 1.0)
-		rng = max_v - min_v
-		if abs(rng) < 1e-6:
-			return 0.0
-		return (raw - min_v) / rng
+		return (raw - self._min) * self._norm_scale
+
+	# min/max are plain attributes to callers; setting either refreshes the
+	# precomputed 1/(max-min) (0 for an empty range) used by normalize_value
+	@property
+	def min(self):
+		return self._min
+
+	@min.setter
+	def min(self, value):
+		self._min = value
+		self._update_norm()
+
+	@property
+	def max(self):
+		return self._max
+
+	@max.setter
+	def max(self, value):
+		self._max = value
+		self._update_norm()
+
+	def _update_norm(self):
+		rng = self._max - self._min
+		self._norm_scale = 0.0 if abs(rng) < 1e-6 else 1.0 / rng
 
 	"""
 	Base class for all features. Subclasses must implement getValue.
 	"""
 	def __init__(self, hand: str, calibration: Optional[Dict[str, Any]] = None):
-		self.hand = hand  # 'left' or 'right'
+		self.hand = hand  # 'left'/'left_hand' or 'right'/'right_hand'
+		# Resolved once; FeatureIndex names hands 'left_hand'/'right_hand'
+		self._is_left = hand in ('left', 'left_hand')
 		self.calibration = calibration or {}
 		self._last_value = None
 		self._last_raw_value = None
+		self._min = 0.0
+		self._max = 1.0
+		self._norm_scale = 1.0
+		self._index = None  # owning FeatureIndex (frame token for _frame_memo), set by FeatureIndex
+		# Frame token + hands of the last evaluation (see _frame_memo)
+		self._last_frame = -1
+		self._last_left = None
+		self._last_right = None
+
+	def _finger_curvatures(self, hand):
+		# (5,) curvatures of the FINGER_IDS rows
+		return _hand_curvatures(hand)
+
+	def _finger_bends(self, hand):
+		# (4,) bend angles of the long fingers
+		return _hand_bends(hand)
+
+	def _ok(self, hand):
+		# Early exit for missing hands, before any landmark is touched. There is no presence
+		# score to gate on here: the Tasks HandLandmarker drops hands below its own
+		# min_hand_presence_confidence and does not report the score (its handedness score
+		# only says Left vs Right and is always >= 0.5)
+		return hand is not None
 
 	def probe_last_value(self):
 		return {'value': self._last_value, 'raw': self._last_raw_value}
@@ -38,35 +188,72 @@ class Feature:
 
 
 
+class _PositionBlock:
+	"""
+	Homography of one calibrated quad, shared by the x and y PositionFeature of a hand:
+	the palm center is projected once per HandState and both axes read the result.
+	"""
+	__slots__ = ('quad', 'H', 'h', '_affine_fast', '_a', '_b', '_c', '_d', '_e', '_f', '_hand', '_uv')
+
+	def __init__(self, quad):
+		self.quad = quad
+		dst = np.array([[0,0],[1,0],[1,1],[0,1]], dtype=np.float32)
+		self.H = cv2.getPerspectiveTransform(quad, dst)
+		# Row-major H as 9 Python floats: projecting one point is cheaper in scalars than numpy
+		self.h = self.H.flatten().tolist()
+		# Near-rectangular quads (the common case) have no perspective term: project with
+		# the 2x3 affine part, pre-divided by H[2,2], and skip the per-point division
+		h = self.h
+		self._affine_fast = abs(h[6]) + abs(h[7]) < 1e-4 and abs(h[8]) > 1e-9
+		if self._affine_fast:
+			self._a, self._b, self._c = h[0]/h[8], h[1]/h[8], h[2]/h[8]
+			self._d, self._e, self._f = h[3]/h[8], h[4]/h[8], h[5]/h[8]
+		self._hand = None
+		self._uv = None
+
+	def project(self, hand):
+		"""(u, v) of the hand's palm center in the quad, or None if it projects to infinity."""
+		if hand is self._hand:
+			return self._uv
+		x, y = hand.nxyz[HandState.PALM_CENTER, :2].tolist()
+		if self._affine_fast:
+			uv = (self._a*x + self._b*y + self._c, self._d*x + self._e*y + self._f)
+		else:
+			h = self.h
+			w = h[6]*x + h[7]*y + h[8]
+			uv = None if w == 0 else ((h[0]*x + h[1]*y + h[2]) / w, (h[3]*x + h[4]*y + h[5]) / w)
+		self._hand = hand
+		self._uv = uv
+		return uv
+
+
 class PositionFeature(Feature):
 	"""
 	Absolute hand position (x or y) in the calibrated quad.
 	"""
-	def __init__(self, hand: str, axis: str, calibration: Dict[str, Any]):
+	__slots__ = ('axis', 'quad', 'H', '_block', '_axis_idx')
+	def __init__(self, hand: str, axis: str, calibration: Dict[str, Any], block: Optional[_PositionBlock] = None):
 		super().__init__(hand, calibration)
 		self.axis = axis
-		self.quad = np.array(calibration.get("quad", [[0,0],[1,0],[1,1],[0,1]]), dtype=np.float32)
-		self.H = self._compute_homography(self.quad)
-
-	def _compute_homography(self, quad):
-		dst = np.array([[0,0],[1,0],[1,1],[0,1]], dtype=np.float32)
-		return cv2.getPerspectiveTransform(quad, dst)
+		self._axis_idx = 0 if axis == "x" else 1
+		if block is None:
+			block = _PositionBlock(np.array(calibration.get("quad", [[0,0],[1,0],[1,1],[0,1]]), dtype=np.float32))
+		self._block = block
+		self.quad = block.quad
+		self.H = block.H
 
 	def getValue(self, left_hand: Optional[HandState], right_hand: Optional[HandState]) -> Optional[float]:
-		hand = left_hand if self.hand == 'left' else right_hand
-		if hand is None:
+		hand = left_hand if self._is_left else right_hand
+		if not self._ok(hand):
 			self._last_value = None
 			self._last_raw_value = None
 			return None
-		pc = hand.landmarks[HandState.PALM_CENTER]
-		v = np.array([pc.x, pc.y, 1.0], dtype=np.float32)
-		w = self.H @ v
-		if w[2] == 0:
+		uv = self._block.project(hand)
+		if uv is None:
 			self._last_value = None
 			self._last_raw_value = None
 			return None
-		u, v = float(w[0]/w[2]), float(w[1]/w[2])
-		val = u if self.axis == "x" else v
+		val = uv[self._axis_idx]
 		self._last_raw_value = val
 		self._last_value = self.normalize_value(val)
 		return self._last_value
@@ -77,42 +264,50 @@ class MovementFeature(Feature):
 	"""
 	Hand movement along a calibrated axis (e.g., up/down, left/right).
 	"""
+	__slots__ = ('axis', 'axis_vec', 'ax', 'ay', 'range_norm', 'prev_px', 'prev_py', 'prev_hand')
 	def __init__(self, hand: str, axis: str, calibration: Dict[str, Any]):
 		super().__init__(hand, calibration)
 		self.axis = axis
 		self.axis_vec = np.array(calibration.get("axis", [0, -1] if axis=="up" else [1, 0]), dtype=np.float32)
+		self.ax, self.ay = float(self.axis_vec[0]), float(self.axis_vec[1])
 		self.range_norm = float(calibration.get("range_norm", 20))
-		self.prev_palm = None
+		self.prev_px = None
+		self.prev_py = None
 		self.prev_hand = None
 		self.min = 0
 		self.max = self.range_norm
 
 	def getValue(self, left_hand: Optional[HandState], right_hand: Optional[HandState]) -> Optional[float]:
-		hand = left_hand if self.hand == 'left' else right_hand
-		# prevent repeated calls for the same hand, each subsequent call would return 0
-		if(hand and self.prev_hand == hand):
+		hand = left_hand if self._is_left else right_hand
+		# prevent repeated calls for the same hand, each subsequent call would return 0.
+		# Identity, not ==: the pipeline builds a new HandState per frame and never mutates one in place
+		if hand is not None and self.prev_hand is hand:
 			return self._last_value
 		self.prev_hand = hand
 
-		if hand is None:
-			self.prev_palm = None
+		if not self._ok(hand):
+			self.prev_px = None
+			self.prev_py = None
 			self.prev_hand = None
 			self._last_value = None
 			self._last_raw_value = None
 			return None
-		pc = hand.landmarks[HandState.PALM_CENTER]
-		if self.prev_palm is None:
-			self.prev_palm = pc.copy()
+		px, py = hand.xy[HandState.PALM_CENTER].tolist()
+		if self.prev_px is None:
+			self.prev_px = px
+			self.prev_py = py
 			self._last_value = 0.0
 			self._last_raw_value = 0.0
 			return 0.0  # neutral
-		d = pc - self.prev_palm
-		self.prev_palm.assign(pc)
-		val = float(np.dot(d.sArray2(), self.axis_vec))
+		dx = px - self.prev_px
+		dy = py - self.prev_py
+		self.prev_px = px
+		self.prev_py = py
+		val = dx*self.ax + dy*self.ay
 		self._last_raw_value = val
 		out = self.normalize_value(val)
 		# Clamp to -1..1 for safety
-		out = max(-1.0, min(1.0, out))
+		out = -1.0 if out < -1.0 else (1.0 if out > 1.0 else out)
 		self._last_value = out
 		return out
 
@@ -122,19 +317,25 @@ class CurvatureFeature(Feature):
 	"""
 	Computes the curvature of a finger given landmark ids for mcp, pip, dip, tip.
 	"""
+	__slots__ = ('ids', 'ids_np', '_finger_idx')
 	def __init__(self, hand: str, ids, calibration: Dict[str, Any]):
 		super().__init__(hand, calibration)
 		self.ids = ids
+		self.ids_np = np.asarray(ids, dtype=np.int32)
+		# Row in the batched finger table, None for a non-standard id set
+		self._finger_idx = _FINGER_ROW.get(tuple(ids))
 		self.min = calibration.get("min", 0.0)
 		self.max = calibration.get("max", 4.0)
 
 	def getValue(self, left_hand: Optional[HandState], right_hand: Optional[HandState]) -> Optional[float]:
-		hand = left_hand if self.hand == 'left' else right_hand
-		if hand is None or not hasattr(hand, "landmarks"):
+		hand = left_hand if self._is_left else right_hand
+		if not self._ok(hand):
 			self._last_value = None
 			return None
-		lms = hand.landmarks
-		curv = finger_curvature_3d(lms, self.ids)
+		if self._finger_idx is not None:
+			curv = float(self._finger_curvatures(hand)[self._finger_idx])
+		else:
+			curv = finger_curvature_3d(hand.xyz, self.ids_np)
 		self._last_raw_value = curv
 		val = self.normalize_value(curv)
 		self._last_value = val
@@ -143,106 +344,97 @@ class CurvatureFeature(Feature):
 
 
 
-class RelativeCurvatureFeature(Feature):
+class _RelativeFeature(Feature):
 	"""
-	Computes the difference between a main CurvatureFeature and the mean of up to two reference CurvatureFeatures.
+	Difference between a main finger feature and the mean of up to two reference fingers of the same kind.
+	Shared by RelativeCurvatureFeature and RelativeBendFeature; subclasses pick the table and default range.
 	"""
-	def __init__(self, hand: str, main: CurvatureFeature, ref1: Optional[CurvatureFeature] = None, ref2: Optional[CurvatureFeature] = None, calibration: Dict[str, Any] = None):
+	__slots__ = ('main', 'ref1', 'ref2', '_main_idx', '_ref_w', '_has_refs')
+	_kind = None  # 'curv' | 'bend': which batched per-hand table to read
+	_default_min = 0.0
+	_default_max = 1.0
+
+	def __init__(self, hand: str, main: Feature, ref1: Optional[Feature] = None, ref2: Optional[Feature] = None, calibration: Dict[str, Any] = None):
 		super().__init__(hand, calibration or {})
 		self.main = main
 		self.ref1 = ref1
 		self.ref2 = ref2
-		self.min = (calibration or {}).get("min", -0.2)
-		self.max = (calibration or {}).get("max", 0.5)
+		ref_idx = [r._finger_idx for r in (ref1, ref2) if r is not None]
+		if main._finger_idx is None or None in ref_idx:
+			raise ValueError(f"{type(self).__name__} needs standard finger features")
+		self._main_idx = main._finger_idx
+		# This finger's row of the reference-mean matrix: 1/len(refs) at each reference finger
+		self._ref_w = np.zeros(4, dtype=np.float32)
+		if ref_idx:
+			self._ref_w[ref_idx] = 1.0 / len(ref_idx)
+		self._has_refs = bool(ref_idx)
+		self.min = (calibration or {}).get("min", self._default_min)
+		self.max = (calibration or {}).get("max", self._default_max)
 
 	def getValue(self, left_hand: Optional[HandState], right_hand: Optional[HandState]) -> Optional[float]:
-		hand = left_hand if self.hand == 'left' else right_hand
-		if hand is None:
-			self._last_value = None
-			return None
-		main_val = finger_curvature_3d(hand.landmarks, self.main.ids) if hand and hasattr(hand, "landmarks") else None
-		ref_vals = []
-		if self.ref1:
-			ref_val1 = finger_curvature_3d(hand.landmarks, self.ref1.ids)
-			ref_vals.append(ref_val1)
-		if self.ref2:
-			ref_val2 = finger_curvature_3d(hand.landmarks, self.ref2.ids)
-			ref_vals.append(ref_val2)
-		if main_val is None or not ref_vals:
+		hand = left_hand if self._is_left else right_hand
+		if not self._ok(hand) or not self._has_refs:
 			self._last_value = None
 			return None
-		mean_ref = sum(ref_vals) / len(ref_vals)
-		diff = main_val - mean_ref
+		if self._index is None:
+			vals = self._finger_curvatures(hand)[:4] if self._kind == 'curv' else self._finger_bends(hand)
+			diff = float(vals[self._main_idx] - self._ref_w @ vals)
+		else:
+			diff = float(_hand_relative(hand, self._kind)[self._main_idx])
 		self._last_raw_value = diff
 		val = self.normalize_value(diff)
 		self._last_value = val
 		return val
-	
+
+
+class RelativeCurvatureFeature(_RelativeFeature):
+	"""
+	Computes the difference between a main CurvatureFeature and the mean of up to two reference CurvatureFeatures.
+	"""
+	__slots__ = ()
+	_kind = 'curv'
+	_default_min = -0.2
+	_default_max = 0.5
+
 class BendFeature(Feature):
+	__slots__ = ('mcp_id', 'pip_id', '_finger_idx')
 	def __init__(self, hand, mcp_id, pip_id, calibration):
 		super().__init__(hand, calibration)
 		self.mcp_id = mcp_id
 		self.pip_id = pip_id
+		# Row in the batched bend table, None for a non-standard finger
+		self._finger_idx = _BEND_ROW.get((mcp_id, pip_id))
 		self.min = calibration.get("min", 0.0)
 		self.max = calibration.get("max", np.pi/2)
 	def getValue(self, left_hand, right_hand):
-		hand = left_hand if self.hand == 'left' else right_hand
-		if hand is None:
+		hand = left_hand if self._is_left else right_hand
+		if not self._ok(hand):
 			self._last_value = None
 			self._last_raw_value = None
 			return None
-		angle = finger_bend_plane_angle(hand, self.mcp_id, self.pip_id)
+		if self._finger_idx is not None:
+			angle = float(self._finger_bends(hand)[self._finger_idx])
+		else:
+			angle = finger_bend_plane_angle(hand, self.mcp_id, self.pip_id)
 		self._last_raw_value = angle
 		val = self.normalize_value(angle)
 		self._last_value = val
 		return val
 	
-class RelativeBendFeature(Feature):
+class RelativeBendFeature(_RelativeFeature):
 	"""
 	Computes the difference between a main BendFeature and the mean of up to two reference BendFeatures.
 	"""
-	def __init__(self, hand: str, main: BendFeature, ref1: Optional[BendFeature] = None, ref2: Optional[BendFeature] = None, calibration: Dict[str, Any] = None):
-		super().__init__(hand, calibration or {})
-		self.main = main
-		self.ref1 = ref1
-		self.ref2 = ref2
-		self.min = (calibration or {}).get("min", -np.pi/2)
-		self.max = (calibration or {}).get("max", np.pi/2)
-
-	def getValue(self, left_hand: Optional[HandState], right_hand: Optional[HandState]) -> Optional[float]:
-		hand = left_hand if self.hand == 'left' else right_hand
-		if hand is None:
-			self._last_value = None
-			return None
-		self.main.getValue(left_hand, right_hand)
-		main_val = self.main._last_raw_value if self.main else None
-
-		ref_vals = []
-		if self.ref1:
-			self.ref1.getValue(left_hand, right_hand)
-			ref_val1 = self.ref1._last_raw_value
-			ref_vals.append(ref_val1)
-		if self.ref2:
-			self.ref2.getValue(left_hand, right_hand)
-			ref_val2 = self.ref2._last_raw_value
-			ref_vals.append(ref_val2)
-		if main_val is None or not ref_vals:
-			self._last_value = None
-			return None
-		# Use raw values for difference
-		main_raw = self.main._last_raw_value
-		ref_raws = [r._last_raw_value for r in [self.ref1, self.ref2] if r is not None]
-		mean_ref = sum(ref_raws) / len(ref_raws)
-		diff = main_raw - mean_ref
-		self._last_raw_value = diff
-		val = self.normalize_value(diff)
-		self._last_value = val
-		return val
+	__slots__ = ()
+	_kind = 'bend'
+	_default_min = -np.pi/2
+	_default_max = np.pi/2
 
 class GestureFeature(Feature):
 	"""
 	Gesture features, e.g., closed hand (average finger curvature).
 	"""
+	__slots__ = ('kind',)
 	def __init__(self, hand: str, kind: str, calibration: Dict[str, Any]):
 		super().__init__(hand, calibration)
 		self.kind = kind
@@ -250,23 +442,14 @@ class GestureFeature(Feature):
 		self.max = calibration.get("max", 0.95)
 
 	def getValue(self, left_hand: Optional[HandState], right_hand: Optional[HandState]) -> Optional[float]:
-		hand = left_hand if self.hand == 'left' else right_hand
-		if hand is None or not hasattr(hand, "landmarks"):
+		hand = left_hand if self._is_left else right_hand
+		if not self._ok(hand):
 			self._last_value = None
 			return None
-		lms = hand.landmarks
 		# Example: closed gesture = avg curvature of index, middle, ring, pinky
 		if self.kind == "closed":
-			idx = HandState.INDEX_FINGER_MCP
-			mid = HandState.MIDDLE_FINGER_MCP
-			ring = HandState.RING_FINGER_MCP
-			pinky = HandState.PINKY_MCP
-			idx_curv = finger_curvature_3d(lms, [idx, idx+1, idx+2, idx+3])
-			mid_curv = finger_curvature_3d(lms, [mid, mid+1, mid+2, mid+3])
-			ring_curv = finger_curvature_3d(lms, [ring, ring+1, ring+2, ring+3])
-			pinky_curv = finger_curvature_3d(lms, [pinky, pinky+1, pinky+2, pinky+3])
-			curvs = [idx_curv, mid_curv, ring_curv, pinky_curv]
-			avg_curv = sum(curvs) / 4.0
+			# Index, middle, ring, pinky rows of the batched finger table
+			avg_curv = float(self._finger_curvatures(hand)[:4].mean())
 			self._last_raw_value = avg_curv
 			val = self.normalize_value(avg_curv)
 			self._last_value = val
@@ -282,26 +465,32 @@ class DistanceFeature(Feature):
 	"""
 	Distance between two landmarks (e.g., fingertips), normalized by palm width.
 	"""
+	__slots__ = ('id1', 'id2', '_tip_pair')
 	def __init__(self, hand: str, id1: int, id2: int, calibration: Dict[str, Any]):
 		super().__init__(hand, calibration)
 		self.id1 = id1
 		self.id2 = id2
+		# Cell of the per-hand distance table, None if either id is not in _DIST_IDS
+		rows = (_DIST_ROW.get(id1), _DIST_ROW.get(id2))
+		self._tip_pair = None if None in rows else rows
 		self.min = calibration.get("min", 0.1)
 		self.max = calibration.get("max", 0.8)
 
 	def getValue(self, left_hand: Optional[HandState], right_hand: Optional[HandState]) -> Optional[float]:
-		hand = left_hand if self.hand == 'left' else right_hand
-		if hand is None or not hasattr(hand, "landmarks"):
+		hand = left_hand if self._is_left else right_hand
+		if not self._ok(hand):
 			self._last_value = None
 			return None
-		lms = hand.landmarks
-		p1 = lms[self.id1]
-		p2 = lms[self.id2]
-		debug_overlay.addLine(p1, p2)
-		diff = p2 - p1
-		val = math.hypot(diff.wx, diff.wy, diff.wz)
+		if debug_overlay.enabled:
+			lms = hand.landmarks
+			debug_overlay.addLine(lms[self.id1], lms[self.id2])
+		if self._tip_pair is not None:
+			val = float(_hand_tip_distances(hand)[self._tip_pair])
+		else:
+			dx, dy, dz = (hand.wxyz[self.id2] - hand.wxyz[self.id1]).tolist()
+			val = sqrt(dx*dx + dy*dy + dz*dz)
 		# # Normalize by palm width
-		# val /= max(1e-6, hand.palm_width)
+		# val *= hand.inv_palm_width
 		self._last_raw_value = val
 		out = self.normalize_value(val)
 		self._last_value = out
@@ -314,6 +503,7 @@ class RotationFeature(Feature):
 	Measures the rotation of the hand around an axis defined by two landmarks, relative to a reference point.
 	Returns the signed angle (in radians) between the vector from ref to axis1 and the vector from ref to axis2, projected onto the axis.
 	"""
+	__slots__ = ('ref_id', 'axis1_id', 'axis2_id')
 	def __init__(self, hand: str, ref_id: int, axis1_id: int, axis2_id: int, calibration: Dict[str, Any]):
 		super().__init__(hand, calibration)
 		self.ref_id = ref_id
@@ -323,36 +513,16 @@ class RotationFeature(Feature):
 		self.max = calibration.get("max", np.pi)
 
 	def getValue(self, left_hand: Optional[HandState], right_hand: Optional[HandState]) -> Optional[float]:
-		hand = left_hand if self.hand == 'left' else right_hand
-		if hand is None or not hasattr(hand, "landmarks"):
+		hand = left_hand if self._is_left else right_hand
+		if not self._ok(hand):
 			self._last_value = None
 			self._last_raw_value = None
 			return None
-		lms = hand.landmarks
-		ref = lms[self.ref_id]
-		a1 = lms[self.axis1_id]
-		a2 = lms[self.axis2_id]
-		v1 = a1 - ref
-		v2 = a2 - ref
-		# Project onto the plane orthogonal to the axis (a2 - a1)
-		axis = a2 - a1
-		axis_vec = axis.sArray()
-		axis_norm = np.linalg.norm(axis_vec)
-		if axis_norm < 1e-6:
+		ok, angle = rotation_angle(hand.xyz, self.ref_id, self.axis1_id, self.axis2_id)
+		if not ok:
 			self._last_value = None
 			self._last_raw_value = None
 			return None
-		axis_unit = axis_vec / axis_norm
-		# Remove axis component from v1 and v2
-		def project_onto_plane(v, axis_unit):
-			v_vec = v.sArray()
-			return v_vec - np.dot(v_vec, axis_unit) * axis_unit
-		v1_proj = project_onto_plane(v1, axis_unit)
-		v2_proj = project_onto_plane(v2, axis_unit)
-		# Angle between projections
-		dot = np.dot(v1_proj, v2_proj)
-		cross = np.cross(v1_proj, v2_proj)
-		angle = math.atan2(np.dot(cross, axis_unit), dot)
 		self._last_raw_value = angle
 		val = self.normalize_value(angle)
 		self._last_value = val
@@ -365,6 +535,8 @@ class RollRotationFeature(Feature):
 	force it to point upwards, project onto the plane spanned by the index-pinky vector and the up vector,
 	then measure the signed angle to the up vector. Positive sign is consistent across hands.
 	"""
+	__slots__ = ()
+
 	def __init__(self, hand: str, calibration: Dict[str, Any]):
 		super().__init__(hand, calibration)
 		# Default roll range about +/- 90 degrees
@@ -372,87 +544,30 @@ class RollRotationFeature(Feature):
 		self.max = calibration.get("max", np.pi/2)
 
 	def getValue(self, left_hand: Optional[HandState], right_hand: Optional[HandState]) -> Optional[float]:
-		hand = left_hand if self.hand == 'left' else right_hand
-		if hand is None or not hasattr(hand, "landmarks"):
+		hand = left_hand if self._is_left else right_hand
+		if not self._ok(hand):
 			self._last_value = None
 			self._last_raw_value = None
 			return None
 
-		lms = hand.landmarks
-		w = lms[HandState.WRIST].sArray()
-		idx = lms[HandState.INDEX_FINGER_MCP].sArray()
-		pky = lms[HandState.PINKY_MCP].sArray()
-
-		# Up vector in screen coords (y up is negative in image space)
-		up = np.array([0.0, 0.0, -1.0], dtype=np.float32)
-		up_norm = np.linalg.norm(up)
-		if up_norm < 1e-6:
-			return None
-		up_u = up / up_norm
-
-		# Palm normal from triangle (wrist, index, pinky)
-		v1 = idx - w
-		v2 = pky - w
-		n = np.cross(v1, v2)
-		n_norm = np.linalg.norm(n)
-		if n_norm < 1e-6:
+		is_left = getattr(hand, 'label', 'Right').lower().startswith('left')
+		ok, angle, n_u, n_proj_u, ip_u = roll_angle(hand.xyz, is_left)
+		if not ok:
 			self._last_value = None
 			self._last_raw_value = None
 			return None
-		n_u = n / n_norm
-
-		# Ensure normal points "up" (flip if pointing down)
-		if not getattr(hand, 'label', 'Right').lower().startswith('left'):
-			n_u = -n_u
-
-		# Index-Pinky direction (from pinky to index)
-		ip = idx - pky
-		ip_norm = np.linalg.norm(ip)
-		if ip_norm < 1e-6:
-			self._last_value = None
-			self._last_raw_value = None
-			return None
-		ip_u = ip / ip_norm
-
-		# Plane normal for plane spanned by ip_u and up_u
-		plane_n = np.cross(ip_u, up_u)
-		plane_n_norm = np.linalg.norm(plane_n)
-		if plane_n_norm < 1e-6:
-			self._last_value = None
-			self._last_raw_value = None
-			return None
-		plane_n_u = plane_n / plane_n_norm
-
-		# Project palm normal onto that plane
-		n_proj = n_u - np.dot(n_u, plane_n_u) * plane_n_u
-		n_proj_norm = np.linalg.norm(n_proj)
-		if n_proj_norm < 1e-6:
-			self._last_value = None
-			self._last_raw_value = None
-			return None
-		n_proj_u = n_proj / n_proj_norm
-
-		# Signed angle from up to projected normal within the plane
-		num = np.dot(np.cross(up_u, n_proj_u), plane_n_u)
-		den = float(np.clip(np.dot(up_u, n_proj_u), -1.0, 1.0))
-		angle = math.atan2(num, den)
-
-		# Normalize sign across hands: make left-hand sign match right-hand
-		if getattr(hand, 'label', 'Right').lower().startswith('left'):
-			angle = -angle
 
 		self._last_raw_value = angle
 		val = self.normalize_value(angle)
 		self._last_value = val
 		# Optional debug vectors
-		try:
-			debug_overlay.addVector(lms[HandState.PALM_CENTER], n_u * 0.1, color=(255, 255, 0))
-			debug_overlay.addVector(lms[HandState.PALM_CENTER], n_proj_u * 0.1, color=(0, 255, 255))
+		if debug_overlay.enabled:
+			pc = hand.nxyz[HandState.PALM_CENTER]
+			debug_overlay.addVector(pc, _scale3(n_u, 0.1), color=(255, 255, 0))
+			debug_overlay.addVector(pc, _scale3(n_proj_u, 0.1), color=(0, 255, 255))
 			# Draw up and IP directions for reference
-			debug_overlay.addVector(lms[HandState.PALM_CENTER], up_u * 0.1, color=(0, 255, 0))
-			debug_overlay.addVector(lms[HandState.PALM_CENTER], ip_u * 0.1, color=(255, 0, 255))
-		except Exception:
-			pass
+			debug_overlay.addVector(pc, _scale3(UP_VEC, 0.1), color=(0, 255, 0))
+			debug_overlay.addVector(pc, _scale3(ip_u, 0.1), color=(255, 0, 255))
 		return val
 
 class FeatureIndex:
@@ -462,39 +577,31 @@ class FeatureIndex:
 
 	def __init__(self, calibration: Dict[str, Any]):
 		self.features: Dict[str, Feature] = {}
+		# Frame token for _frame_memo; the shared geometry itself is cached on each HandState
+		self._frame = 0
 
 		for hand in ("right_hand", "left_hand"):
-			# Position features
+			# Position features, both axes projected through one shared homography block
+			pos_block = None
 			for axis in ("x", "y"):
 				key = f"{hand}.pos.{axis}"
-				self.features[key] = PositionFeature(hand, axis, calibration.get(f"{hand}.pos", {}))
+				self.features[key] = PositionFeature(hand, axis, calibration.get(f"{hand}.pos", {}), pos_block)
+				pos_block = self.features[key]._block
 			# Movement features
 			for axis in ("up", "left"):
 				key = f"{hand}.motion.{axis}"
 				self.features[key] = MovementFeature(hand, axis, calibration.get(f"{hand}.motion.{axis}", {}))
 
 			# Curvature features for each finger (full finger)
-			finger_names = [
-				("index", [HandState.INDEX_FINGER_MCP, HandState.INDEX_FINGER_PIP, HandState.INDEX_FINGER_DIP, HandState.INDEX_FINGER_TIP]),
-				("middle", [HandState.MIDDLE_FINGER_MCP, HandState.MIDDLE_FINGER_PIP, HandState.MIDDLE_FINGER_DIP, HandState.MIDDLE_FINGER_TIP]),
-				("ring", [HandState.RING_FINGER_MCP, HandState.RING_FINGER_PIP, HandState.RING_FINGER_DIP, HandState.RING_FINGER_TIP]),
-				("pinky", [HandState.PINKY_MCP, HandState.PINKY_PIP, HandState.PINKY_DIP, HandState.PINKY_TIP]),
-			]
-			for name, ids in finger_names:
+			for name, ids in FINGER_NAMES:
 				key = f"{hand}.curv.{name}"
 				self.features[key] = CurvatureFeature(hand, ids, calibration.get(f"{hand}.curv.{name}", {}))
-			self.features[f"{hand}.curv.thumb"] = CurvatureFeature(hand, [HandState.THUMB_CMC, HandState.THUMB_MCP, HandState.THUMB_IP, HandState.THUMB_TIP], calibration.get(f"{hand}.curv.thumb", {}))
+			self.features[f"{hand}.curv.thumb"] = CurvatureFeature(hand, THUMB_IDS, calibration.get(f"{hand}.curv.thumb", {}))
 
 			# Relative curvature features for each finger (difference to mean of adjacent fingers)
-			rel_refs = {
-				"index":  ["middle"],
-				"middle": ["index", "ring"],
-				"ring":   ["middle", "pinky"],
-				"pinky":  ["ring"],
-			}
-			for name, ids in finger_names:
+			for name, ids in FINGER_NAMES:
 				main = self.features[f"{hand}.curv.{name}"]
-				ref_names = rel_refs[name]
+				ref_names = REL_REFS[name]
 				ref1 = self.features.get(f"{hand}.curv.{ref_names[0]}")
 				ref2 = self.features.get(f"{hand}.curv.{ref_names[1]}") if len(ref_names) > 1 else None
 				key = f"{hand}.curv.{name}.rel"
@@ -502,15 +609,15 @@ class FeatureIndex:
 
 			# Bend features: angle to palm plane (MCP->PIP vs palm plane)
 
-			for name, ids in finger_names:
+			for name, ids in FINGER_NAMES:
 				key = f"{hand}.bend.{name}"
 
 				self.features[key] = BendFeature(hand, ids[0], ids[3], calibration.get(key, {}))
 
 			# Relative bend features
-			for name, ids in finger_names:
+			for name, ids in FINGER_NAMES:
 				main = self.features[f"{hand}.bend.{name}"]
-				ref_names = rel_refs[name]
+				ref_names = REL_REFS[name]
 				ref1 = self.features.get(f"{hand}.bend.{ref_names[0]}")
 				ref2 = self.features.get(f"{hand}.bend.{ref_names[1]}") if len(ref_names) > 1 else None
 				key = f"{hand}.bend.{name}.rel"
@@ -520,15 +627,8 @@ class FeatureIndex:
 			self.features[f"{hand}.gesture.closed"] = GestureFeature(hand, "closed", calibration.get(f"{hand}.gesture.closed", {}))
 
 			# Distance features: all combinations between fingertips (thumb, index, middle, ring, pinky)
-			fingertip_names = [
-				("thumb", HandState.THUMB_TIP),
-				("index", HandState.INDEX_FINGER_TIP),
-				("middle", HandState.MIDDLE_FINGER_TIP),
-				("ring", HandState.RING_FINGER_TIP),
-				("pinky", HandState.PINKY_TIP),
-			]
-			for i, (name1, id1) in enumerate(fingertip_names):
-				for j, (name2, id2) in enumerate(fingertip_names):
+			for i, (name1, id1) in enumerate(FINGERTIP_NAMES):
+				for j, (name2, id2) in enumerate(FINGERTIP_NAMES):
 					if i >= j:
 						continue  # avoid duplicates and self
 					key1 = f"{hand}.dist.{name1}.{name2}"
@@ -553,5 +653,55 @@ class FeatureIndex:
 				calibration.get(rot_key, {})
 			)
 
+		for feature in self.features.values():
+			feature._index = self
+
+		# Fixed evaluation order (see evaluate): leaves before the features derived from them.
+		# Aliased keys share one instance, so each feature is listed once.
+		unique = list({id(f): f for f in self.features.values()}.values())
+		def bucket(cls):
+			return [f for f in unique if type(f) is cls]
+		self._curvs = bucket(CurvatureFeature)
+		self._bends = bucket(BendFeature)
+		self._rel_curvs = bucket(RelativeCurvatureFeature)
+		self._rel_bends = bucket(RelativeBendFeature)
+		self._gestures = bucket(GestureFeature)
+		self._dists = bucket(DistanceFeature)
+		self._pos = bucket(PositionFeature)
+		self._mov = bucket(MovementFeature)
+		ordered = (self._curvs + self._bends + self._rel_curvs + self._rel_bends
+				   + self._gestures + self._dists + self._pos + self._mov)
+		seen = {id(f) for f in ordered}
+		self._eval_order = ordered + [f for f in unique if id(f) not in seen]
+
+	def begin_frame(self):
+		"""Advance the frame token used by _frame_memo; call once per frame before evaluating features."""
+		self._frame += 1
+
+	def evaluation_order(self, features) -> list:
+		"""The given features (e.g. those a BindingIndex reads) as a sublist of the fixed order."""
+		wanted = {id(f) for f in features if f is not None}
+		return [f for f in self._eval_order if id(f) in wanted]
+
+	def evaluate(self, left_hand: Optional[HandState], right_hand: Optional[HandState], order: list) -> None:
+		"""
+		Evaluate the features of order (from evaluation_order) once for the current frame,
+		leaves before the features derived from them; the shared per-hand tables are
+		filled by the first feature that reads them. Later getValue calls in the same
+		frame return the memoized value. Call begin_frame() first.
+		A feature that raises is left unmemoized with no value; its own caller sees the
+		error again (gates treat it as lost, as before).
+		"""
+		for feature in order:
+			try:
+				feature.getValue(left_hand, right_hand)
+			except Exception:
+				feature._last_value = None
+
+	def evaluate_all(self, left_hand: Optional[HandState], right_hand: Optional[HandState]) -> Dict[str, Optional[float]]:
+		"""Evaluate every feature once for the current frame and return {name: value}."""
+		self.evaluate(left_hand, right_hand, self._eval_order)
+		return {name: f._last_value for name, f in self.features.items()}
+
 	def getFeature(self, name: str) -> Optional[Feature]:
 		return self.features.get(name)
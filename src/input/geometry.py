@@ -1,66 +1,281 @@
 
+import functools
+import math
+
 import numpy as np
 
 from src.input.HandState import HandState
+from src.jit import HAS_NUMBA, njit
 from src.ui.debug_overlay import debug_overlay
 
 
-# Calculate the angle between a finger segment and the palm plane (INDEX_FINGER_MCP, PINKY_MCP, WRIST)
+# Plain ints so the jitted kernels see them as compile-time constants
+_WRIST = HandState.WRIST
+_INDEX_MCP = HandState.INDEX_FINGER_MCP
+_PINKY_MCP = HandState.PINKY_MCP
+
+def _bend_planes_numpy(xyz, normal, mcp_ids, pip_ids):
+    finger_vecs = (xyz[pip_ids] - xyz[mcp_ids]).astype(np.float64)
+    finger_vecs /= np.linalg.norm(finger_vecs, axis=1, keepdims=True) + 1e-9
+    # Angle between finger_vec and palm plane (0 = in plane, pi/2 = orthogonal); abs: up/down alike
+    dotprod = np.clip(finger_vecs @ normal, -1.0, 1.0)
+    return np.arcsin(np.abs(dotprod)), finger_vecs
+
+@njit('Tuple((f8[:], f8[:, :]))(f4[:, :], f8[:], i4[:], i4[:])', cache=True, fastmath=True)
+def _bend_planes_jit(xyz, normal, mcp_ids, pip_ids):
+    n = mcp_ids.shape[0]
+    angles = np.empty(n)
+    finger_vecs = np.empty((n, 3))
+    for f in range(n):
+        m = mcp_ids[f]
+        p = pip_ids[f]
+        fx = xyz[p, 0] - xyz[m, 0]; fy = xyz[p, 1] - xyz[m, 1]; fz = xyz[p, 2] - xyz[m, 2]
+        inv = 1.0 / (math.sqrt(fx * fx + fy * fy + fz * fz) + 1e-9)
+        fx *= inv; fy *= inv; fz *= inv
+        d = fx * normal[0] + fy * normal[1] + fz * normal[2]
+        d = min(1.0, max(-1.0, d))
+        angles[f] = math.asin(abs(d))
+        finger_vecs[f, 0] = fx; finger_vecs[f, 1] = fy; finger_vecs[f, 2] = fz
+    return angles, finger_vecs
+
+_bend_planes = _bend_planes_jit if HAS_NUMBA else _bend_planes_numpy
+
+# Calculate the angle between a finger segment and the palm plane (WRIST, INDEX_FINGER_MCP, MIDDLE_FINGER_MCP)
 def finger_bend_plane_angle(hand, mcp_id, pip_id):
     """
-    Returns the angle (in radians) between the MCP->PIP vector and the palm plane defined by INDEX_FINGER_MCP, PINKY_MCP, WRIST.
+    Returns the angle (in radians) between the MCP->PIP vector and the palm plane defined by WRIST, INDEX_FINGER_MCP, MIDDLE_FINGER_MCP.
     0 = finger is in the plane, pi/2 = finger is perpendicular to the plane.
     """
-    def L3(p): return np.array([p.x, p.y, p.z], dtype=np.float32)
-    lms = hand.landmarks
-    # Palm plane
-    mcp1 = lms[HandState.INDEX_FINGER_MCP].sArray()
-    mcp2 = lms[HandState.MIDDLE_FINGER_MCP].sArray()
-    wrist = lms[HandState.WRIST].sArray()
-    v1 = mcp1 - wrist
-    v2 = mcp2 - wrist
-    normal = np.cross(v1, v2)
-    normal = normal / (np.linalg.norm(normal) + 1e-9)
-
-    # Finger vector
-    mcp = lms[mcp_id].sArray()
-    pip = lms[pip_id].sArray()
-    finger_vec = pip - mcp
-
-    finger_vec = finger_vec / (np.linalg.norm(finger_vec) + 1e-9)
+    return float(finger_bend_plane_angles(hand, _ids_array((mcp_id,)), _ids_array((pip_id,)))[0])
 
+def finger_bend_plane_angles(hand, mcp_ids, pip_ids):
+    """
+    Vectorized finger_bend_plane_angle for several fingers at once.
+    mcp_ids, pip_ids: (F,) int32 arrays of landmark ids. Returns an (F,) array of angles.
+    The palm normal comes from HandState.palm_normal_u, computed once per hand.
+    """
+    normal = hand.palm_normal_u
+    angles, finger_vecs = _bend_planes(hand.xyz, normal, mcp_ids, pip_ids)
+    if debug_overlay.enabled:
+        for mcp_id, finger_vec in zip(mcp_ids.tolist(), finger_vecs):
+            origin = hand.nxyz[mcp_id]
+            debug_overlay.addVector(origin, normal * 0.1, color=(255, 255, 0))  # Palm normal
+            debug_overlay.addVector(origin, finger_vec * 0.1)
+    return angles
 
+def _finger_curvature_numpy(xyz, ids):
+    if len(ids) < 3:
+        return 0.0
+    # All interior joints at once: one gather, then row-wise dot products and norms
+    pts = xyz[ids]
+    b = pts[1:-1]
+    v1 = pts[:-2] - b
+    v2 = pts[2:] - b
+    cosang = np.einsum('ij,ij->i', v1, v2) / (np.linalg.norm(v1, axis=1) * np.linalg.norm(v2, axis=1) + 1e-9)
+    # Only K-2 angles: scalar libm acos beats np.clip/np.arccos dispatch on arrays this small
+    total = 0.0
+    for c in cosang.tolist():
+        total += math.pi - math.acos(max(-1.0, min(1.0, c)))
+    return max(0.0, total)
 
-    debug_overlay.addVector(L3(lms[mcp_id]), normal * 0.1, color=(255, 255, 0))  # Palm normal
+@njit('f8(f4[:, :], i4[:])', cache=True, fastmath=True)
+def _finger_curvature_jit(xyz, ids):
+    total = 0.0
+    for k in range(1, ids.shape[0] - 1):
+        a = ids[k - 1]; b = ids[k]; c = ids[k + 1]
+        v1x = xyz[a, 0] - xyz[b, 0]; v1y = xyz[a, 1] - xyz[b, 1]; v1z = xyz[a, 2] - xyz[b, 2]
+        v2x = xyz[c, 0] - xyz[b, 0]; v2y = xyz[c, 1] - xyz[b, 1]; v2z = xyz[c, 2] - xyz[b, 2]
+        n1 = math.sqrt(v1x * v1x + v1y * v1y + v1z * v1z)
+        n2 = math.sqrt(v2x * v2x + v2y * v2y + v2z * v2z)
+        cosang = (v1x * v2x + v1y * v2y + v1z * v2z) / (n1 * n2 + 1e-9)
+        cosang = min(1.0, max(-1.0, cosang))
+        total += math.pi - math.acos(cosang)
+    return max(0.0, total)
 
-    debug_overlay.addVector(L3(lms[mcp_id]), finger_vec * 0.1)  # Palm normal
+_finger_curvature = _finger_curvature_jit if HAS_NUMBA else _finger_curvature_numpy
 
-    # Angle between finger_vec and palm plane (0 = in plane, pi/2 = orthogonal)
-    dotprod = np.dot(finger_vec, normal)
-    dotprod = np.clip(dotprod, -1.0, 1.0)
-    angle = np.arcsin(abs(dotprod))  # abs: treat up/down as same
-    return angle
+@functools.lru_cache(maxsize=None)
+def _ids_array(ids):
+    return np.asarray(ids, dtype=np.int32)
 
-def finger_curvature_3d(lms, ids):
+def finger_curvature_3d(xyz, ids):
     """
     Compute finger curvature in 3D for a sequence of landmark ids (at least 3).
+    xyz: (N,3) float32 landmark array (HandState.xyz); ids: int32 array or tuple of ids.
     Returns sum of (pi - angle) at each interior joint (higher = more bent, 0 = straight).
     """
-    if len(ids) < 3:
-        return 0.0
-    pts = [lms[i] for i in ids]
-    total = 0.0
-    for i in range(1, len(pts)-1):
-        a, b, c = pts[i-1].sArray(), pts[i].sArray(), pts[i+1].sArray()
-        v1 = a - b
-        v2 = c - b
-        n1 = np.linalg.norm(v1)
-        n2 = np.linalg.norm(v2)
-        cosang = np.dot(v1, v2) / (n1 * n2  + 1e-9)
-        cosang = np.clip(cosang, -1.0, 1.0)
-        angle = np.arccos(cosang)
-        total += (np.pi - angle)
-    return max(0.0, total)
+    if not isinstance(ids, np.ndarray):
+        ids = _ids_array(tuple(ids))
+    return _finger_curvature(xyz, ids)
+
+def finger_curvatures_3d(xyz, ids):
+    """
+    Vectorized finger_curvature_3d for several fingers at once.
+    xyz: (N,3) landmark array; ids: (F,K) int array of landmark ids per finger (K >= 3).
+    Returns an (F,) array of curvatures.
+    """
+    pts = xyz[ids]                       # (F,K,3)
+    b = pts[:, 1:-1]
+    v1 = pts[:, :-2] - b
+    v2 = pts[:, 2:] - b
+    n1 = np.linalg.norm(v1, axis=-1)
+    n2 = np.linalg.norm(v2, axis=-1)
+    cosang = np.einsum('fkj,fkj->fk', v1, v2) / (n1 * n2 + 1e-9)
+    angle = np.arccos(np.clip(cosang, -1.0, 1.0))
+    return np.maximum(0.0, (np.pi - angle).sum(axis=1))
+
+# 3-vector helpers on Python float tuples for the non-Numba rotation kernels
+def _dot3(a, b):
+    return a[0]*b[0] + a[1]*b[1] + a[2]*b[2]
+
+def _cross3(a, b):
+    return (a[1]*b[2] - a[2]*b[1], a[2]*b[0] - a[0]*b[2], a[0]*b[1] - a[1]*b[0])
+
+def _sub3(a, b):
+    return (a[0] - b[0], a[1] - b[1], a[2] - b[2])
+
+def _scale3(a, k):
+    return (a[0]*k, a[1]*k, a[2]*k)
+
+def _norm3(a):
+    return math.sqrt(a[0]*a[0] + a[1]*a[1] + a[2]*a[2])
+
+# Up vector in screen coords (y up is negative in image space), unit length
+UP_VEC = (0.0, 0.0, -1.0)
+_ZERO3 = (0.0, 0.0, 0.0)
+
+def _rotation_angle_py(xyz, ref_id, axis1_id, axis2_id):
+    ref = xyz[ref_id].tolist()
+    a1 = xyz[axis1_id].tolist()
+    a2 = xyz[axis2_id].tolist()
+    v1 = _sub3(a1, ref)
+    v2 = _sub3(a2, ref)
+    # Project onto the plane orthogonal to the axis (a2 - a1)
+    axis_vec = _sub3(a2, a1)
+    axis_norm = _norm3(axis_vec)
+    if axis_norm < 1e-6:
+        return False, 0.0
+    axis_unit = _scale3(axis_vec, 1.0 / axis_norm)
+    # Remove axis component from v1 and v2
+    v1_proj = _sub3(v1, _scale3(axis_unit, _dot3(v1, axis_unit)))
+    v2_proj = _sub3(v2, _scale3(axis_unit, _dot3(v2, axis_unit)))
+    # Angle between projections
+    return True, math.atan2(_dot3(_cross3(v1_proj, v2_proj), axis_unit), _dot3(v1_proj, v2_proj))
+
+@njit('Tuple((b1, f8))(f4[:, :], i8, i8, i8)', cache=True, fastmath=True)
+def _rotation_angle_jit(xyz, ref_id, axis1_id, axis2_id):
+    v1x = xyz[axis1_id, 0] - xyz[ref_id, 0]; v1y = xyz[axis1_id, 1] - xyz[ref_id, 1]; v1z = xyz[axis1_id, 2] - xyz[ref_id, 2]
+    v2x = xyz[axis2_id, 0] - xyz[ref_id, 0]; v2y = xyz[axis2_id, 1] - xyz[ref_id, 1]; v2z = xyz[axis2_id, 2] - xyz[ref_id, 2]
+    ax = v2x - v1x; ay = v2y - v1y; az = v2z - v1z
+    axis_norm = math.sqrt(ax * ax + ay * ay + az * az)
+    if axis_norm < 1e-6:
+        return False, 0.0
+    ax /= axis_norm; ay /= axis_norm; az /= axis_norm
+    d1 = v1x * ax + v1y * ay + v1z * az
+    d2 = v2x * ax + v2y * ay + v2z * az
+    p1x = v1x - d1 * ax; p1y = v1y - d1 * ay; p1z = v1z - d1 * az
+    p2x = v2x - d2 * ax; p2y = v2y - d2 * ay; p2z = v2z - d2 * az
+    cx = p1y * p2z - p1z * p2y; cy = p1z * p2x - p1x * p2z; cz = p1x * p2y - p1y * p2x
+    return True, math.atan2(cx * ax + cy * ay + cz * az, p1x * p2x + p1y * p2y + p1z * p2z)
+
+# rotation_angle(xyz, ref, axis1, axis2) -> (ok, angle): signed angle of the ref->axis1 and
+# ref->axis2 vectors around the axis1->axis2 axis; ok is False for a degenerate axis
+rotation_angle = _rotation_angle_jit if HAS_NUMBA else _rotation_angle_py
+
+def _roll_angle_py(xyz, is_left):
+    w = xyz[HandState.WRIST].tolist()
+    idx = xyz[HandState.INDEX_FINGER_MCP].tolist()
+    pky = xyz[HandState.PINKY_MCP].tolist()
+    up_u = UP_VEC
+    fail = (False, 0.0, _ZERO3, _ZERO3, _ZERO3)
+
+    # Palm normal from triangle (wrist, index, pinky)
+    n = _cross3(_sub3(idx, w), _sub3(pky, w))
+    n_norm = _norm3(n)
+    if n_norm < 1e-6:
+        return fail
+    # Ensure normal points "up" (flip if pointing down)
+    n_u = _scale3(n, (1.0 if is_left else -1.0) / n_norm)
+
+    # Index-Pinky direction (from pinky to index)
+    ip = _sub3(idx, pky)
+    ip_norm = _norm3(ip)
+    if ip_norm < 1e-6:
+        return fail
+    ip_u = _scale3(ip, 1.0 / ip_norm)
+
+    # Plane normal for plane spanned by ip_u and up_u
+    plane_n = _cross3(ip_u, up_u)
+    plane_n_norm = _norm3(plane_n)
+    if plane_n_norm < 1e-6:
+        return fail
+    plane_n_u = _scale3(plane_n, 1.0 / plane_n_norm)
+
+    # Project palm normal onto that plane
+    n_proj = _sub3(n_u, _scale3(plane_n_u, _dot3(n_u, plane_n_u)))
+    n_proj_norm = _norm3(n_proj)
+    if n_proj_norm < 1e-6:
+        return fail
+    n_proj_u = _scale3(n_proj, 1.0 / n_proj_norm)
+
+    # Signed angle from up to projected normal within the plane
+    num = _dot3(_cross3(up_u, n_proj_u), plane_n_u)
+    den = max(-1.0, min(1.0, _dot3(up_u, n_proj_u)))
+    angle = math.atan2(num, den)
+    # Normalize sign across hands: make left-hand sign match right-hand
+    if is_left:
+        angle = -angle
+    return True, angle, n_u, n_proj_u, ip_u
+
+@njit('Tuple((b1, f8, UniTuple(f8, 3), UniTuple(f8, 3), UniTuple(f8, 3)))(f4[:, :], b1)', cache=True, fastmath=True)
+def _roll_angle_jit(xyz, is_left):
+    w = _WRIST; i = _INDEX_MCP; k = _PINKY_MCP
+    zero = (0.0, 0.0, 0.0)
+    ax = xyz[i, 0] - xyz[w, 0]; ay = xyz[i, 1] - xyz[w, 1]; az = xyz[i, 2] - xyz[w, 2]
+    bx = xyz[k, 0] - xyz[w, 0]; by = xyz[k, 1] - xyz[w, 1]; bz = xyz[k, 2] - xyz[w, 2]
+    nx = ay * bz - az * by; ny = az * bx - ax * bz; nz = ax * by - ay * bx
+    n_norm = math.sqrt(nx * nx + ny * ny + nz * nz)
+    if n_norm < 1e-6:
+        return False, 0.0, zero, zero, zero
+    s = (1.0 if is_left else -1.0) / n_norm
+    nx *= s; ny *= s; nz *= s
+    ipx = xyz[i, 0] - xyz[k, 0]; ipy = xyz[i, 1] - xyz[k, 1]; ipz = xyz[i, 2] - xyz[k, 2]
+    ip_norm = math.sqrt(ipx * ipx + ipy * ipy + ipz * ipz)
+    if ip_norm < 1e-6:
+        return False, 0.0, zero, zero, zero
+    ipx /= ip_norm; ipy /= ip_norm; ipz /= ip_norm
+    # plane normal = ip_u x up, with up = (0, 0, -1)
+    px = -ipy; py = ipx; pz = 0.0
+    p_norm = math.sqrt(px * px + py * py)
+    if p_norm < 1e-6:
+        return False, 0.0, zero, zero, zero
+    px /= p_norm; py /= p_norm
+    d = nx * px + ny * py + nz * pz
+    qx = nx - d * px; qy = ny - d * py; qz = nz - d * pz
+    q_norm = math.sqrt(qx * qx + qy * qy + qz * qz)
+    if q_norm < 1e-6:
+        return False, 0.0, zero, zero, zero
+    qx /= q_norm; qy /= q_norm; qz /= q_norm
+    # (up x n_proj_u) . plane_n_u and up . n_proj_u, with up = (0, 0, -1)
+    num = qy * px - qx * py
+    den = min(1.0, max(-1.0, -qz))
+    angle = math.atan2(num, den)
+    if is_left:
+        angle = -angle
+    return True, angle, (nx, ny, nz), (qx, qy, qz), (ipx, ipy, ipz)
+
+# roll_angle(xyz, is_left) -> (ok, angle, palm normal, projected normal, index-pinky direction),
+# see RollRotationFeature; ok is False for a degenerate hand
+roll_angle = _roll_angle_jit if HAS_NUMBA else _roll_angle_py
+
+# Compile/load the kernels from cache at import rather than on the first frame
+_warm = np.zeros((22, 3), dtype=np.float32)
+_finger_curvature(_warm, _ids_array((5, 6, 7, 8)))
+_bend_planes(_warm, np.zeros(3), _ids_array((5, 9)), _ids_array((8, 12)))
+rotation_angle(_warm, 17, 0, 21)
+roll_angle(_warm, True)
+del _warm
+
 # Geometry helpers for hand tracking and palm/finger analysis
 import math
 
@@ -79,15 +294,47 @@ def dot(a, b):
 def norm(a):
     return math.hypot(a[0], a[1]) + 1e-9
 
-def palm_center(lms ):
-    pts = [HandState.INDEX_FINGER_MCP, HandState.MIDDLE_FINGER_MCP, HandState.RING_FINGER_MCP, HandState.PINKY_MCP]
-    s = lms[HandState.WRIST].copy()
-    for i in pts:
-        s += lms[i]
-    s /= (len(pts) + 1)
-    return s
+# Landmarks averaged into the palm center (HandState.PALM_CENTER)
+PALM_CENTER_IDS = np.array(HandState.PALM_CENTER_IDS, dtype=np.int32)
+
+def palm_center(xyz):
+    # xyz: (N,3) landmark array of any space (xyz, nxyz or wxyz); returns the (3,) palm center
+    return xyz[PALM_CENTER_IDS].mean(axis=0)
 
 # Compute palm width (distance between pinky and index MCPs) in world coordinates
-def palm_width(lms):
-    width_vector = lms[HandState.PINKY_MCP] - lms[HandState.INDEX_FINGER_MCP]
-    return math.hypot(width_vector.wx, width_vector.wy, width_vector.wz)
+def palm_width(wxyz):
+    # wxyz: (N,3) world-space landmark array (HandState.wxyz)
+    dx, dy, dz = (wxyz[HandState.PINKY_MCP] - wxyz[HandState.INDEX_FINGER_MCP]).tolist()
+    return math.sqrt(dx*dx + dy*dy + dz*dz)
+
+def _fill_hand_coords_numpy(coords, scale):
+    xyz, nxyz, wxyz = coords
+    nxyz[-1] = palm_center(nxyz)
+    wxyz[-1] = palm_center(wxyz)
+    np.multiply(nxyz, scale, out=xyz)
+    return palm_width(wxyz)
+
+@njit('f8(f4[:, :, ::1], f4[::1])', cache=True, fastmath=True, boundscheck=False)
+def _fill_hand_coords_jit(coords, scale):
+    n = coords.shape[1]
+    pc = n - 1
+    inv = 1.0 / PALM_CENTER_IDS.shape[0]
+    for s in (1, 2):
+        for k in range(3):
+            acc = 0.0
+            for i in PALM_CENTER_IDS:
+                acc += coords[s, i, k]
+            coords[s, pc, k] = acc * inv
+    for i in range(n):
+        for k in range(3):
+            coords[0, i, k] = coords[1, i, k] * scale[k]
+    dx = coords[2, _PINKY_MCP, 0] - coords[2, _INDEX_MCP, 0]
+    dy = coords[2, _PINKY_MCP, 1] - coords[2, _INDEX_MCP, 1]
+    dz = coords[2, _PINKY_MCP, 2] - coords[2, _INDEX_MCP, 2]
+    return math.sqrt(dx * dx + dy * dy + dz * dz)
+
+# fill_hand_coords(coords, scale) -> palm_width: completes a HandState.coords buffer whose
+# normalized and world rows hold the tracker landmarks: writes both palm-center rows and the
+# screen rows (normalized * scale) in place, in one pass when Numba is available
+fill_hand_coords = _fill_hand_coords_jit if HAS_NUMBA else _fill_hand_coords_numpy
+fill_hand_coords(np.zeros((3, 22, 3), dtype=np.float32), np.ones(3, dtype=np.float32))
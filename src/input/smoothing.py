@@ -1,9 +1,13 @@
 # HandSmoother: smooths HandState landmarks over a time window
+import math
 import time
-from collections import deque
 from typing import Optional
+
+import numpy as np
+
 from src.input.HandState import HandState
 from src.input.geometry import palm_width
+from src.input.tracker import MultiLandmark
 
 
 class HandSmootherIndex:
@@ -22,13 +26,28 @@ class HandSmootherIndex:
 			smoothed[label] = self.smoothe(label, hand)
 		return smoothed
 
+# Upper bound on the camera frame rate, used to size the smoothing ring buffer
+_FPS_UPPER = 120
+
+
 class HandSmoother:
 	def __init__(self, smoothing_time: float):
 		"""
 		smoothing_time: window in seconds (e.g., 0.12 for 120ms)
 		"""
 		self.smoothing_time = smoothing_time
-		self._window = deque()  # Each entry: (timestamp, HandState)
+		# Ring buffer of the window's landmark arrays, one (3,22,3) HandState.coords block per
+		# frame, plus their running sum so a frame costs one add and one evict
+		self._capacity = max(2, int(math.ceil(smoothing_time * _FPS_UPPER)) + 1)
+		self._buf = np.empty((self._capacity, 3, HandState.PALM_CENTER + 1, 3), dtype=np.float32)
+		self._ts = np.empty(self._capacity, dtype=np.float64)
+		self._sum = np.zeros((3, HandState.PALM_CENTER + 1, 3), dtype=np.float64)
+		self._head = 0    # slot of the oldest frame
+		self._count = 0
+		self._newest = None  # newest HandState: label, visibility and landmark metadata
+		# Last raw input and its smoothed result, so asking twice for one frame is free
+		self._last_raw = None
+		self._last_smoothed = None
 
 	def add(self, hand: HandState, timestamp: Optional[float] = None):
 		"""
@@ -36,44 +55,68 @@ class HandSmoother:
 		"""
 		if timestamp is None:
 			timestamp = time.time()
-		self._window.append((timestamp, hand))
+		if self._count == self._capacity:
+			self._evict()
+		slot = (self._head + self._count) % self._capacity
+		block = self._buf[slot]
+		block[...] = hand.coords
+		self._ts[slot] = timestamp
+		self._sum += block
+		self._count += 1
+		self._newest = hand
+
+	def _evict(self):
+		self._sum -= self._buf[self._head]
+		self._head = (self._head + 1) % self._capacity
+		self._count -= 1
+		if self._count == 0:
+			self._sum[:] = 0.0  # drop accumulated rounding error
+			self._newest = None
 
 	def _prune(self, now: float):
 		cutoff = now - self.smoothing_time
-		while self._window and self._window[0][0] < cutoff:
-			self._window.popleft()
+		while self._count and self._ts[self._head] < cutoff:
+			self._evict()
 
 	def get_smoothed(self) -> Optional[HandState]:
 		"""
 		Return a HandState with averaged landmarks over the window, or None if window is empty.
 		"""
-		if not self._window:
+		if not self._count:
 			return None
-		
-
-		avg_lms = []
-		# Compute the average for each landmark
-		for i in range(len(self._window[-1][1].landmarks)):
-			avg_lm = None
-			for t, hand in reversed(self._window):
-				if avg_lm is None:
-					avg_lm = hand.landmarks[i]*3.0
-				else:
-					avg_lm += hand.landmarks[i]
-			avg_lm /= len(self._window) + 2
-			avg_lms.append(avg_lm)
-			
+		newest = self._newest
+
+		# Weighted mean from the running sum: the newest frame counts 3x, the others 1x,
+		# so the weights sum to count + 2
+		last = self._buf[(self._head + self._count - 1) % self._capacity]
+		avg = ((self._sum + 2.0 * last) * (1.0 / (self._count + 2))).astype(np.float32)
+		nxyz, wxyz = avg[1], avg[2]
+
+		# Landmark objects for the debug overlay, rebuilt from the averaged rows
+		frame_shape = newest.landmarks[0].frame_shape
+		avg_lms = [
+			MultiLandmark.from_values(n, w, lm.visibility, lm.presence, frame_shape)
+			for n, w, lm in zip(nxyz.tolist(), wxyz.tolist(), newest.landmarks)
+		]
+
 		# Return a new HandState with the averaged landmarks
 		return HandState(
-			label=self._window[-1][1].label,
+			label=newest.label,
 			landmarks=avg_lms,
-			palm_width=palm_width(avg_lms)
+			palm_width=palm_width(wxyz),
+			coords=avg,
+			visibility=newest.visibility
 		)
 	def smooth(self, hand: HandState, timestamp: Optional[float] = None) -> Optional[HandState]:
 		"""
 		Add a new HandState and return the smoothed version.
+		Passing the same HandState again returns the cached result without re-adding it.
 		"""
+		if hand is self._last_raw:
+			return self._last_smoothed
 		now = time.time() if timestamp is None else timestamp
 		self.add(hand, now)
 		self._prune(now)
-		return self.get_smoothed()
+		self._last_raw = hand
+		self._last_smoothed = self.get_smoothed()
+		return self._last_smoothed
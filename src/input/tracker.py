@@ -1,19 +1,17 @@
 # MediaPipe hand landmarker wrapper (placeholder)
 from __future__ import annotations
-import numpy as np
-from src.input.HandState import HandState
-from src.input.geometry import palm_center, palm_width
-
+import queue
+import threading
+from itertools import chain
+from typing import List
 
+import cv2
+import numpy as np
 import mediapipe as mp
 from mediapipe.tasks.python.components.containers.landmark import NormalizedLandmark, Landmark
 
-
-from typing import List
-
-
-
-
+from src.input.HandState import HandState
+from src.input.geometry import fill_hand_coords
 
 vision = mp.tasks.vision
 
@@ -26,23 +24,65 @@ MPImage = mp.Image
 
 Z_AMPLIFICATION = 1.5
 
-class MultiLandmark(NormalizedLandmark):
-    def __init__(self, lm: NormalizedLandmark, wlm: Landmark,  frame_shape):
-        super().__init__(lm.x, lm.y, lm.z, lm.visibility, lm.presence)
-        self.frame_shape = frame_shape
-        self.sx = lm.x * frame_shape[1]
-        self.sy = lm.y * frame_shape[0]
-        self.sz = lm.z * frame_shape[0]
+class MultiLandmark:
+    """
+    One landmark in normalized, screen and world space. Holds the MediaPipe landmark
+    objects by reference; the coordinates are read through on access, nothing is copied.
+    """
+    __slots__ = ('lm', 'wlm', 'frame_shape', 'z_scale')
+
+    def __init__(self, lm: NormalizedLandmark, wlm: Landmark,  frame_shape, z_scale: float = 1.0):
+        self.lm = lm
         self.wlm = wlm
-        self.wx = wlm.x
-        self.wy = wlm.y
-        self.wz = wlm.z
+        self.frame_shape = frame_shape
+        # Depth amplification applied on read (the MediaPipe objects are left untouched)
+        self.z_scale = z_scale
+    @classmethod
+    def from_values(cls, n, w, visibility, presence, frame_shape):
+        # Build from plain (x, y, z) normalized and world coordinates
+        return cls(NormalizedLandmark(n[0], n[1], n[2], visibility, presence),
+                   Landmark(w[0], w[1], w[2]), frame_shape)
+
+    @property
+    def x(self):
+        return self.lm.x
+    @property
+    def y(self):
+        return self.lm.y
+    @property
+    def z(self):
+        return self.lm.z * self.z_scale
+    @property
+    def visibility(self):
+        return self.lm.visibility
+    @property
+    def presence(self):
+        return self.lm.presence
+    @property
+    def sx(self):
+        return self.lm.x * self.frame_shape[1]
+    @property
+    def sy(self):
+        return self.lm.y * self.frame_shape[0]
+    @property
+    def sz(self):
+        return self.lm.z * self.z_scale * self.frame_shape[0]
+    @property
+    def wx(self):
+        return self.wlm.x
+    @property
+    def wy(self):
+        return self.wlm.y
+    @property
+    def wz(self):
+        return self.wlm.z * self.z_scale
+
     def nTuple(self):
         return (self.x, self.y, self.z)
     def sTuple(self):
         return (self.sx, self.sy, self.sz)
     def wTuple(self):
-        return (self.wlm.x, self.wlm.y, self.wlm.z)
+        return (self.wlm.x, self.wlm.y, self.wz)
     def nArray(self):
         return np.array([self.x, self.y, self.z])
     def sArray(self):
@@ -60,213 +100,48 @@ class MultiLandmark(NormalizedLandmark):
         return np.array([self.sx, self.sy])
 
     def assign(self, other: MultiLandmark):
-        self.x = other.x
-        self.y = other.y
-        self.z = other.z
-        self.sx = other.sx
-        self.sy = other.sy
-        self.sz = other.sz
+        self.lm = other.lm
         self.wlm = other.wlm
-        self.wx = self.wlm.x
-        self.wy = self.wlm.y
-        self.wz = self.wlm.z
+        self.z_scale = other.z_scale
 
     def copy(self):
         return MultiLandmark(
                 NormalizedLandmark(self.x, self.y, self.z, self.visibility, self.presence),
-                Landmark(self.wlm.x, self.wlm.y, self.wlm.z, self.wlm.visibility, self.wlm.presence ),
+                Landmark(self.wlm.x, self.wlm.y, self.wz, self.wlm.visibility, self.wlm.presence ),
                 self.frame_shape
         )
-    
-    def __add__(self, o):
-        # MultiLandmark + MultiLandmark
-        if isinstance(o, MultiLandmark):
-            return MultiLandmark(
-                NormalizedLandmark(self.x + o.x, self.y + o.y, self.z + o.z, self.visibility, self.presence),
-                Landmark(self.wlm.x + o.wlm.x, self.wlm.y + o.wlm.y, self.wlm.z + o.wlm.z, self.wlm.visibility, self.wlm.presence ),
-                self.frame_shape
-            )
-        # MultiLandmark + np.array or tuple/list
-        arr = None
-        if isinstance(o, np.ndarray) and o.shape == (3,):
-            arr = o
-        elif isinstance(o, (tuple, list)) and len(o) == 3:
-            arr = np.array(o)
-        if arr is not None:
-            return MultiLandmark(
-                NormalizedLandmark(self.x + arr[0], self.y + arr[1], self.z + arr[2], self.visibility, self.presence),
-                Landmark(self.wlm.x + arr[0], self.wlm.y + arr[1], self.wlm.z + arr[2], self.wlm.visibility, self.wlm.presence ),
-                self.frame_shape
-            )
-        return NotImplemented
-    def __sub__(self, o):
-        # MultiLandmark - MultiLandmark
-        if isinstance(o, MultiLandmark):
-            return MultiLandmark(
-                NormalizedLandmark(self.x - o.x, self.y - o.y, self.z - o.z, self.visibility, self.presence),
-                Landmark(self.wlm.x - o.wlm.x, self.wlm.y - o.wlm.y, self.wlm.z - o.wlm.z, self.wlm.visibility, self.wlm.presence ),
-                self.frame_shape
-            )
-        # MultiLandmark - np.array or tuple/list
-        arr = None
-        if isinstance(o, np.ndarray) and o.shape == (3,):
-            arr = o
-        elif isinstance(o, (tuple, list)) and len(o) == 3:
-            arr = np.array(o)
-        if arr is not None:
-            return MultiLandmark(
-                NormalizedLandmark(self.x - arr[0], self.y - arr[1], self.z - arr[2], self.visibility, self.presence),
-                Landmark(self.wlm.x - arr[0], self.wlm.y - arr[1], self.wlm.z - arr[2], self.wlm.visibility, self.wlm.presence ),
-                self.frame_shape
-            )
-        return NotImplemented
-    def __mul__(self, o):
-        # check if number
-        try:
-            val = float(o)
-            return MultiLandmark(
-                NormalizedLandmark(self.x * val, self.y * val, self.z * val, self.visibility, self.presence),
-                Landmark(self.wlm.x * val, self.wlm.y * val, self.wlm.z * val, self.wlm.visibility, self.wlm.presence ),
-                self.frame_shape
-            )
-        except ValueError:
-            pass
-    
-    def __truediv__(self, o):
-        # check if number
-        try:
-            val = float(o)
-            return MultiLandmark(
-                NormalizedLandmark(self.x / val, self.y / val, self.z / val, self.visibility, self.presence),
-                Landmark(self.wlm.x / val, self.wlm.y / val, self.wlm.z / val, self.wlm.visibility, self.wlm.presence ),
-                self.frame_shape
-            )
-        except ValueError:
-            pass
-
-    def __iadd__(self, o):
-        if isinstance(o, MultiLandmark):
-            self.x += o.x
-            self.y += o.y
-            self.z += o.z
-            self.sx += o.sx
-            self.sy += o.sy
-            self.sz += o.sz
-            self.wlm.x += o.wlm.x
-            self.wlm.y += o.wlm.y
-            self.wlm.z += o.wlm.z
-            self.wx = self.wlm.x
-            self.wy = self.wlm.y
-            self.wz = self.wlm.z
-            return self
-        arr = None
-        if isinstance(o, np.ndarray) and o.shape == (3,):
-            arr = o
-        elif isinstance(o, (tuple, list)) and len(o) == 3:
-            arr = np.array(o)
-        if arr is not None:
-            self.x += arr[0]
-            self.y += arr[1]
-            self.z += arr[2]
-            self.sx += arr[0]
-            self.sy += arr[1]
-            self.sz += arr[2]
-            self.wlm.x += arr[0]
-            self.wlm.y += arr[1]
-            self.wlm.z += arr[2]
-            self.wx = self.wlm.x
-            self.wy = self.wlm.y
-            self.wz = self.wlm.z
-            return self
-        return NotImplemented
-    def __isub__(self, o):
-        if isinstance(o, MultiLandmark):
-            self.x -= o.x
-            self.y -= o.y
-            self.z -= o.z
-            self.sx -= o.sx
-            self.sy -= o.sy
-            self.sz -= o.sz
-            self.wlm.x -= o.wlm.x
-            self.wlm.y -= o.wlm.y
-            self.wlm.z -= o.wlm.z
-            self.wx = self.wlm.x
-            self.wy = self.wlm.y
-            self.wz = self.wlm.z
-            return self
-        arr = None
-        if isinstance(o, np.ndarray) and o.shape == (3,):
-            arr = o
-        elif isinstance(o, (tuple, list)) and len(o) == 3:
-            arr = np.array(o)
-        if arr is not None:
-            self.x -= arr[0]
-            self.y -= arr[1]
-            self.z -= arr[2]
-            self.sx -= arr[0]
-            self.sy -= arr[1]
-            self.sz -= arr[2]
-            self.wlm.x -= arr[0]
-            self.wlm.y -= arr[1]
-            self.wlm.z -= arr[2]
-            self.wx = self.wlm.x
-            self.wy = self.wlm.y
-            self.wz = self.wlm.z
-            return self
-        return NotImplemented
-    def __imul__(self, o):
-        # check if number
-        try:
-            val = float(o)
-            self.x *= val
-            self.y *= val
-            self.z *= val
-            self.sx *= val
-            self.sy *= val
-            self.sz *= val
-            self.wlm.x *= val
-            self.wlm.y *= val
-            self.wlm.z *= val
-            self.wx = self.wlm.x
-            self.wy = self.wlm.y
-            self.wz = self.wlm.z
-            return self
-        except ValueError:
-            pass
-    
-    def __idiv__(self, o):
-        # check if number
-        try:
-            val = float(o)
-            self.x /= val
-            self.y /= val
-            self.z /= val
-            self.sx /= val
-            self.sy /= val
-            self.sz /= val
-            self.wlm.x /= val
-            self.wlm.y /= val
-            self.wlm.z /= val
-            self.wx = self.wlm.x
-            self.wy = self.wlm.y
-            self.wz = self.wlm.z
-            return self
-        except ValueError:
-            pass
 
 class HandTracker:
     def __init__(self, model_path: str):
+        # One OpenCV worker: the per-frame cv2 work (colour conversion) is small, and its pool
+        # would contend with MediaPipe's inference threads for the same cores (tail latency)
+        cv2.setNumThreads(1)
         options = HandLandmarkerOptions(
-            base_options=BaseOptions(model_asset_path=model_path),
+            base_options=BaseOptions(model_asset_path=model_path, delegate=BaseOptions.Delegate.CPU),
             num_hands=2, running_mode=RunningMode.VIDEO)
         self.landmarker = HandLandmarker.create_from_options(options)
+        self._init_buffers()
+
+    def _init_buffers(self):
+        # Normalized -> screen scale (W, H, H), rebuilt only when the frame size changes
+        self._scale_shape = None
+        self._scale = None
 
-    def detect(self, rgb_frame, ts_ms: int) -> List[HandState]:
+    def detect(self, rgb_frame, ts_ms: int, frame_shape=None) -> List[HandState]:
+        # frame_shape: shape of the displayed frame when rgb_frame is a downscaled copy of it;
+        # screen coordinates are in that frame's pixels (normalized/world ones don't depend on it)
+        if frame_shape is None:
+            frame_shape = rgb_frame.shape
         mp_img = MPImage(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
         res = self.landmarker.detect_for_video(mp_img, ts_ms)
         out = []
         if not res.hand_landmarks:
             return out
+        if frame_shape != self._scale_shape:
+            h, w = frame_shape[:2]
+            self._scale = np.array([w, h, h], dtype=np.float32)
+            self._scale_shape = frame_shape
+        scale = self._scale
         # handedness length matches landmarks list
         for i, nlms in enumerate(res.hand_landmarks):
             wlms = res.hand_world_landmarks[i]
@@ -274,15 +149,111 @@ class HandTracker:
             if res.handedness and i < len(res.handedness) and len(res.handedness[i]) > 0:
                 label = res.handedness[i][0].category_name  # "Left"/"Right"
 
-            # Transform landmarks to screen space coordinates
-            lms = []
-            for i, lm in enumerate(nlms):
-                wlm = wlms[i]
-                lm.z *= Z_AMPLIFICATION
-                wlm.z *= Z_AMPLIFICATION
-                lms.append(MultiLandmark(lm, wlm, rgb_frame.shape))
-            lms.append(palm_center(lms))  # add palm center as extra landmark
-            pw = palm_width(lms)
-            out.append(HandState(label=label, landmarks=lms, palm_width=pw))
+            # One (3,N,3) buffer per hand: screen, normalized and world rows (see HandState.coords)
+            n = len(nlms)
+            coords = np.empty((3, n + 1, 3), dtype=np.float32)
+            # Normalized and world landmarks in one bulk pass, no intermediate tuples or lists
+            coords[1:, :-1] = np.fromiter(
+                chain.from_iterable((lm.x, lm.y, lm.z) for lm in chain(nlms, wlms)),
+                dtype=np.float32, count=6 * n).reshape(2, n, 3)
+            # Depth amplification on the arrays only: MediaPipe's output objects are treated as read-only
+            coords[1:, :-1, 2] *= Z_AMPLIFICATION
+            # Palm center as extra landmark, screen rows and palm width in one kernel call
+            pw = fill_hand_coords(coords, scale)
+
+            # Landmark objects are kept for the debug overlay and legacy callers only
+            # (the palm center has no object; it is the PALM_CENTER row of coords)
+            lms = [MultiLandmark(lm, wlm, frame_shape, Z_AMPLIFICATION) for lm, wlm in zip(nlms, wlms)]
+            vis = [np.nan if lm.visibility is None else lm.visibility for lm in nlms]
+            vis.append(vis[HandState.WRIST])  # palm center row reports the wrist's visibility
+            visibility = np.array(vis, dtype=np.float32)
+            out.append(HandState(label=label, landmarks=lms, palm_width=pw,
+                                 coords=coords, visibility=visibility))
         return out
 
+
+def _put_latest(q: queue.Queue, item):
+    # Single-slot queue: an item still waiting there is replaced by the newer one
+    while True:
+        try:
+            q.put_nowait(item)
+            return
+        except queue.Full:
+            try:
+                q.get_nowait()
+            except queue.Empty:
+                pass
+
+
+class DetectionWorker:
+    """
+    Runs a HandTracker on a background thread so inference overlaps the render loop
+    (MediaPipe releases the GIL while it runs). submit() hands over the newest frame,
+    dropping one that was not picked up yet; latest() returns each (hands, ts_ms)
+    result once and None while nothing newer is available.
+    detect_width: frames wider than this are downscaled (INTER_AREA) before inference.
+    MediaPipe resizes to its own small model inputs anyway, so this mainly saves colour
+    conversion and ingestion bandwidth; screen coordinates stay in full-frame pixels.
+    0 keeps the full resolution.
+    opencl: run the resize and colour conversion through OpenCV's transparent API (UMat)
+    when an OpenCL device is available. Off by default: at 640x480 the upload/download
+    costs more than the two ops save unless the CPU is the bottleneck.
+    """
+    def __init__(self, tracker: HandTracker, detect_width: int = 0, opencl: bool = False):
+        self.tracker = tracker
+        self.detect_width = int(detect_width)
+        self.opencl = bool(opencl) and cv2.ocl.haveOpenCL()
+        if self.opencl:
+            cv2.ocl.setUseOpenCL(True)
+        # Resize target, consumed by the conversion right away, so one buffer is enough
+        self._small_buf = None
+        self._in = queue.Queue(maxsize=1)
+        self._out = queue.Queue(maxsize=1)
+        self._thread = threading.Thread(target=self._run, name="hand-detect", daemon=True)
+        self._thread.start()
+
+    def submit(self, bgr_frame, ts_ms: int):
+        # A fresh RGB array per frame rather than a shared buffer: the caller keeps drawing
+        # on bgr_frame, and a queued frame must not be overwritten by the next one
+        h, w = bgr_frame.shape[:2]
+        if self.opencl:
+            src = cv2.UMat(bgr_frame)
+            if 0 < self.detect_width < w:
+                size = (self.detect_width, max(1, round(h * self.detect_width / w)))
+                src = cv2.resize(src, size, interpolation=cv2.INTER_AREA)
+            # MediaPipe needs host memory: download once, after both ops
+            rgb = cv2.cvtColor(src, cv2.COLOR_BGR2RGB).get()
+            _put_latest(self._in, (rgb, ts_ms, bgr_frame.shape))
+            return
+        src = bgr_frame
+        if 0 < self.detect_width < w:
+            size = (self.detect_width, max(1, round(h * self.detect_width / w)))
+            buf = self._small_buf
+            if buf is None or buf.shape[1::-1] != size:
+                buf = self._small_buf = np.empty((size[1], size[0], 3), dtype=np.uint8)
+            src = cv2.resize(bgr_frame, size, dst=buf, interpolation=cv2.INTER_AREA)
+        rgb = cv2.cvtColor(src, cv2.COLOR_BGR2RGB)
+        _put_latest(self._in, (rgb, ts_ms, bgr_frame.shape))
+
+    def latest(self):
+        try:
+            return self._out.get_nowait()
+        except queue.Empty:
+            return None
+
+    def close(self, timeout: float = 1.0):
+        _put_latest(self._in, None)
+        self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            item = self._in.get()
+            if item is None:
+                return
+            rgb, ts_ms, frame_shape = item
+            try:
+                hands = self.tracker.detect(rgb, ts_ms, frame_shape)
+            except Exception as e:
+                print(f"[tracker] detection failed: {e}")
+                continue
+            _put_latest(self._out, (hands, ts_ms))
@@ -1,9 +1,33 @@
 import os
 import platform
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 import cv2
 
+# Parallel device probes in enumerate(); VideoCapture open/read release the GIL
+_PROBE_WORKERS = 8
+# How long an enumerate() result is reused by next()/prev() before probing again
+_ENUM_TTL_S = 5.0
+
+
+def _build_backend_names():
+    # Backend id -> 'CAP_*' name, built once. Plain vars(cv2) matching is ambiguous:
+    # CAP_PROP_* and other constants share the backend ids (200 is also
+    # CAP_PROP_GSTREAMER_QUEUE_LENGTH, 0 is also CAP_OPENNI_DEPTH_MAP, ...)
+    names = {cv2.CAP_ANY: "CAP_ANY"}
+    registry = getattr(cv2, "videoio_registry", None)
+    if registry is not None:
+        for b in registry.getBackends():
+            names.setdefault(int(b), "CAP_" + registry.getBackendName(b))
+    for k, v in vars(cv2).items():
+        if k.startswith("CAP_") and not k.startswith("CAP_PROP_") and isinstance(v, int):
+            names.setdefault(v, k)
+    return names
+
+_BACKEND_NAMES = _build_backend_names()
+
 
 class CameraSwitcher:
     def __init__(self, width=640, height=480, fps=30, max_search=20,
@@ -14,6 +38,9 @@ class CameraSwitcher:
         self.idx = None
         self.backend = preferred_backend
         self.backends = self._default_backends_for_os()
+        # Last enumerate() result and when it was taken (see _ENUM_TTL_S)
+        self._enum_cache = None
+        self._enum_ts = 0.0
 
         # Linux: map /sys/class/video4linux names and /dev/v4l/by-id symlinks
         self.linux_index_name = self._linux_video_names() if self._is_linux() else {}
@@ -77,34 +104,57 @@ class CameraSwitcher:
         cap.set(cv2.CAP_PROP_FRAME_WIDTH,  self.width)
         cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
         cap.set(cv2.CAP_PROP_FPS, self.fps)
+        # Keep only the newest frame in the driver queue (V4L2/DirectShow default to
+        # ~4, i.e. 100+ ms of lag); backends that don't support it ignore the hint
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
         ok, _ = cap.read()
         if not ok:
             cap.release()
             return None
         return cap
 
-    def enumerate(self):
+    def _probe_cap(self, index, backend):
+        # Existence check for enumerate(): no capture mode setup and no decoded frame;
+        # open() still verifies the device with a real read before using it
+        cap = cv2.VideoCapture(index, backend)
+        try:
+            return cap.isOpened() and cap.get(cv2.CAP_PROP_FRAME_WIDTH) > 0
+        finally:
+            cap.release()
+
+    def _probe_indices(self):
+        # Linux: only the /dev/video* nodes sysfs knows about (re-read, so hotplugged cameras show up)
+        if self._is_linux():
+            self.linux_index_name = self._linux_video_names()
+            if self.linux_index_name:
+                return sorted(i for i in self.linux_index_name if i < self.max_search)
+        return list(range(self.max_search))
+
+    def enumerate(self, refresh: bool = False):
+        # Reuse a recent scan: probing opens every device and can take seconds
+        if (not refresh and self._enum_cache is not None
+                and time.monotonic() - self._enum_ts < _ENUM_TTL_S):
+            return self._enum_cache
         found = []
         tried = []
         backends = [self.backend] + self.backends if self.backend else self.backends
+        indices = self._probe_indices()
         seen_pairs = set()
-        for b in backends:
-            for i in range(self.max_search):
-                if (i, b) in seen_pairs:
-                    continue
-                seen_pairs.add((i, b))
-                tried.append((i, b))
-                cap = self._open_cap(i, b)
-                if cap:
-                    name = self.linux_index_name.get(i) if self._is_linux() else None
-                    found.append({"index": i, "backend": b, "name": name})
-                    cap.release()
+        found_indices = set()
+        with ThreadPoolExecutor(max_workers=_PROBE_WORKERS) as pool:
+            # One backend at a time, its indices in parallel; an index found via an
+            # earlier (preferred) backend is not probed again via the later ones
+            for b in backends:
+                jobs = [i for i in indices if (i, b) not in seen_pairs and i not in found_indices]
+                seen_pairs.update((i, b) for i in jobs)
+                tried.extend((i, b) for i in jobs)
+                for i, present in zip(jobs, pool.map(self._probe_cap, jobs, [b] * len(jobs))):
+                    if present:
+                        name = self.linux_index_name.get(i) if self._is_linux() else None
+                        found.append({"index": i, "backend": b, "name": name})
+                        found_indices.add(i)
         # Diagnostics
-        def bname(b):
-            for k, v in vars(cv2).items():
-                if k.startswith("CAP_") and v == b:
-                    return k
-            return str(b)
+        bname = self._backend_name
         if not found:
             print("[camera] No cameras found.")
             print("[camera] Tried:")
@@ -123,6 +173,8 @@ class CameraSwitcher:
             for d in found:
                 print(f"  - index {d['index']} via {bname(d['backend'])}"
                       + (f" name='{d['name']}'" if d.get("name") else ""))
+        self._enum_cache = found
+        self._enum_ts = time.monotonic()
         return found
 
     def open(self, preferred_index=None):
@@ -206,11 +258,9 @@ class CameraSwitcher:
         elif key_ascii == ord('['):
             return self.prev()
         elif key_ascii in (ord('r'), ord('R')):
+            self._enum_cache = None  # explicit rescan: drop the cached device list
             return self.open(None)  # rescan and open first working
         return self.cap, self.idx
 
     def _backend_name(self, b):
-        for k, v in vars(cv2).items():
-            if k.startswith("CAP_") and v == b:
-                return k
-        return str(b)
+        return _BACKEND_NAMES.get(b, str(b))
@@ -0,0 +1,13 @@
+# Optional Numba JIT support; falls back to plain Python when numba is not installed
+try:
+	from numba import njit, prange  # type: ignore
+	HAS_NUMBA = True
+except Exception:
+	HAS_NUMBA = False
+	prange = range
+
+	def njit(*args, **kwargs):
+		# Works both as @njit and as @njit(signature, cache=True, ...)
+		if len(args) == 1 and callable(args[0]) and not kwargs:
+			return args[0]
+		return lambda fn: fn
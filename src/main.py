@@ -18,14 +18,22 @@ import os, sys, math, time
 from dataclasses import dataclass, field
 from typing import Dict, Any, Optional, List, Tuple
 
+# Keep the BLAS/OpenMP pools small before numpy loads them: per-frame math runs on tiny
+# arrays, and idle pool threads only compete with MediaPipe and capture for the cores.
+# Values already set in the environment win.
+os.environ.setdefault("OMP_NUM_THREADS", "2")
+os.environ.setdefault("OPENBLAS_NUM_THREADS", "1")
+os.environ.setdefault("MKL_NUM_THREADS", "1")
+
 import cv2
 import numpy as np
 from src.input.HandState import HandState
 from src.input.smoothing import HandSmootherIndex
-from src.input.tracker import HandTracker
+from src.input.tracker import HandTracker, DetectionWorker
 from src.io.camera import CameraSwitcher
 from src.config import loader as config_loader
 from src.ui.debug_overlay import debug_overlay
+from src.ui.overlay import TextOverlay
 
 
 # -------------------- Paths --------------------
@@ -41,19 +49,96 @@ MODEL_CANDIDATES = [
     os.path.join(HERE, "hand_landmarker.task"),
 ]
 
-def download_hand_landmarker_task(dest_path: str) -> bool:
+def download_hand_landmarker_task(dest_path: str, expected_sha256: Optional[str] = None) -> bool:
     """
     Download the hand_landmarker.task model file from MediaPipe if not present.
+    Streams into dest_path + ".part" and only renames it into place once complete and
+    verified (length, member CRCs of the task bundle, optional SHA-256), so a truncated
+    or corrupt file is never picked up as the model. A partial download left by a failed
+    run is resumed with a Range request guarded by If-Range with the ETag/Last-Modified
+    saved next to it: if the file on the server changed in between, the server sends the
+    whole new file and the download starts over instead of splicing two versions.
     Returns True if download succeeded, False otherwise.
     """
-    import urllib.request
+    import hashlib, shutil, zipfile
+    import urllib.error, urllib.request
     url = "https://storage.googleapis.com/mediapipe-models/hand_landmarker/hand_landmarker/float16/latest/hand_landmarker.task"
+    part = dest_path + ".part"
+    validator_path = part + ".validator"
+
+    def discard():
+        for path in (part, validator_path):
+            if os.path.exists(path):
+                os.remove(path)
+
     try:
         os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-        print(f"[info] Downloading hand_landmarker.task to {dest_path} ...")
-        urllib.request.urlretrieve(url, dest_path)
+        have = os.path.getsize(part) if os.path.exists(part) else 0
+        validator = None
+        if have and os.path.exists(validator_path):
+            with open(validator_path, "r", encoding="utf-8") as f:
+                validator = f.read().strip() or None
+        req = urllib.request.Request(url)
+        if have and validator:
+            req.add_header("Range", f"bytes={have}-")
+            req.add_header("If-Range", validator)
+            print(f"[info] Resuming download of hand_landmarker.task at {have} bytes ...")
+        else:
+            # Nothing to resume, or no validator to resume it safely with
+            have = 0
+            print(f"[info] Downloading hand_landmarker.task to {dest_path} ...")
+        with urllib.request.urlopen(req, timeout=30) as resp:
+            # 206: the server continues the unchanged partial file; 200: full body, start over
+            resume = have > 0 and resp.status == 206
+            if resume and not (resp.headers.get("Content-Range") or "").startswith(f"bytes {have}-"):
+                discard()
+                raise ValueError("server resumed at an unexpected offset")
+            if not resume:
+                # If-Range needs a strong ETag; fall back to Last-Modified
+                etag = resp.headers.get("ETag")
+                validator = etag if etag and not etag.startswith("W/") else resp.headers.get("Last-Modified")
+                if validator:
+                    with open(validator_path, "w", encoding="utf-8") as f:
+                        f.write(validator)
+                elif os.path.exists(validator_path):
+                    os.remove(validator_path)
+            length = resp.headers.get("Content-Length")
+            expected_size = (have if resume else 0) + int(length) if length is not None else None
+            with open(part, "ab" if resume else "wb") as f:
+                shutil.copyfileobj(resp, f, length=1 << 16)
+        size = os.path.getsize(part)
+        if expected_size is not None and size != expected_size:
+            print(f"[error] Download incomplete ({size} of {expected_size} bytes); rerun to resume.")
+            return False
+        # .task files are zip bundles of the TFLite models: check every member's CRC,
+        # not just that the file ends in a zip directory
+        try:
+            with zipfile.ZipFile(part) as bundle:
+                valid = bundle.testzip() is None
+        except Exception:  # BadZipFile, or a member that fails to decompress
+            valid = False
+        if not valid:
+            discard()
+            print("[error] Downloaded file is not a valid model bundle.")
+            return False
+        if expected_sha256:
+            h = hashlib.sha256()
+            with open(part, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 16), b""):
+                    h.update(chunk)
+            if h.hexdigest() != expected_sha256.lower():
+                discard()
+                print("[error] Downloaded model failed the SHA-256 check.")
+                return False
+        os.replace(part, dest_path)
+        discard()
         print("[info] Download complete.")
         return True
+    except urllib.error.HTTPError as e:
+        if e.code == 416:
+            discard()  # stale partial the server can't continue: start over next time
+        print(f"[error] Failed to download hand_landmarker.task: {e}")
+        return False
     except Exception as e:
         print(f"[error] Failed to download hand_landmarker.task: {e}")
         return False
@@ -81,6 +166,37 @@ def parse_sensitivity(val, screen_w, screen_h) -> float:
         return -out if neg else out
     return 0.0
 
+DEBUG_PROBE_KEYS = ('feature', 'gate', 'actuator', 'binding_state', 'binding_value', 'binding_time')
+
+def _fmt_float(v):
+    sign = "+" if v >= 0 else ""
+    return f"{sign}{v:.3f}"
+
+# Exact-type formatters for the common probe values (one dict lookup, no isinstance chain)
+_FMT = {
+    bool: lambda v: "1" if v else "0",
+    float: _fmt_float,
+    int: str,
+    str: str,
+    type(None): str,
+}
+
+def fmt_probe(v):
+    # Compact text for a binding probe value in the overlay
+    f = _FMT.get(type(v))
+    if f is not None:
+        return f(v)
+    # Containers and subclasses (numpy scalars, ...) keep the isinstance checks
+    if isinstance(v, bool):
+        return "1" if v else "0"
+    if isinstance(v, float):
+        return _fmt_float(v)
+    if isinstance(v, dict):
+        return '{' + ', '.join(f"{kk}: {fmt_probe(vv)}" for kk, vv in v.items()) + '}'
+    if isinstance(v, list):
+        return '[' + ', '.join(fmt_probe(x) for x in v) + ']'
+    return str(v)
+
 # -------------------- Smoothing --------------------
 class TimeEMA:
     def __init__(self, tau_ms=120.0, init=None):
@@ -115,8 +231,7 @@ def main():
     cfg_path = DEFAULT_CONFIG_PATH
     if len(sys.argv) > 1:
         cfg_path = sys.argv[1]
-    cfg = config_loader.load_yaml(cfg_path)
-    cfg = config_loader.ensure_defaults(cfg)
+    cfg = config_loader.load_config(cfg_path)
 
 
     # Find model, try download if not found
@@ -143,16 +258,35 @@ def main():
         sys.exit(1)
     # TODO: enumerate device name/ID per platform; for now save index
     cfg["last_camera"]["index"] = cam_idx
-    config_loader.write_yaml(cfg_path, cfg)
+    config_loader.write_config(cfg_path, cfg)
+    # Later camera changes are persisted from a background thread, debounced
+    cfg_writer = config_loader.DeferredConfigWriter(cfg_path, cfg)
+
+    def remember_camera(idx):
+        if idx is not None and cfg["last_camera"].get("index") != idx:
+            cfg["last_camera"]["index"] = idx
+            cfg_writer.request()
+
+    # 3D debug overlay; off skips all debug drawing work in the feature math
+    debug_overlay_cfg = bool(cfg.get("debug_overlay", True))
+    debug_overlay.enabled = debug_overlay_cfg
+    # All on-screen text and drawing (help lines, binding probes, 3D overlay); 'o' toggles it
+    overlay_enabled = bool(cfg.get("overlay", True))
+    if not overlay_enabled:
+        debug_overlay.enabled = False
 
     # Tracker
     tracker = HandTracker(model_path)
+    # Inference runs on its own thread; the loop below submits frames and picks up results
+    detector = DetectionWorker(tracker, detect_width=int(cfg.get("detect_width", 320)),
+                               opencl=bool(cfg.get("opencl", False)))
     smoother = HandSmootherIndex(smoothing_time=cfg.get("smoothing", {}).get("hand_ms", 120)/1000.0)
 
 
     # --- Modular pipeline: FeatureIndex, ActuatorBuilder, GateBuilder, BindingIndex ---
     from src.input.features import FeatureIndex
     from src.outputs.actuators import ActuatorBuilder
+    from src.outputs.mouse import mouse_out
     from src.gate.gate import GateBuilder
     from src.binding.binding import BindingIndex
 
@@ -171,80 +305,103 @@ def main():
     binding_index = BindingIndex(cfg, feature_index, actuator_builder, gate_builder)
 
 
-    font = cv2.FONT_HERSHEY_SIMPLEX
-    last_seen_ms = int(time.time()*1000)
+    # Per-binding debug keys from config, resolved once; bindings without any are skipped
+    # (the first config entry with a given id wins, as before)
+    id_to_debug = {}
+    for cfg_b in cfg.get('bindings', []):
+        id_to_debug.setdefault(cfg_b.get('id'), cfg_b.get('debug'))
+    binding_debug = []
+    for i, binding in enumerate(binding_index.bindings):
+        debug = id_to_debug.get(binding.id) if hasattr(binding, 'id') else None
+        if isinstance(debug, list) and debug:
+            binding_debug.append((i, binding, set(debug)))
+
+    text_overlay = TextOverlay(cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0,255,255), 2)
+    # Frame timestamps in integer ms from the monotonic clock: never jump with wall-clock
+    # adjustments, which MediaPipe's VIDEO mode (strictly increasing timestamps) relies on
+    monotonic_ns = time.monotonic_ns
+    last_seen_ms = monotonic_ns() // 1_000_000
+
+    # Every camera frame is grabbed, but only decoded and tracked at up to process_fps;
+    # surplus frames are dropped before decoding. A quarter interval of slack keeps a
+    # camera running at the target rate from losing frames to timing jitter.
+    # CameraSwitcher asks the driver for a 1-frame buffer; if a driver ignores that and
+    # lags, draining it with grab() under a small time budget before retrieve() also works.
+    process_fps = float(cfg.get("process_fps", 30))
+    process_interval_ms = 1000.0 / process_fps if process_fps > 0 else 0.0
+    next_process_ms = 0.0
+    left_hand = right_hand = None
 
     while True:
-        ok, frame = cap.read()
+        ok = cap.grab()
+        if ok:
+            ts = monotonic_ns() // 1_000_000
+            if ts < next_process_ms - 0.25 * process_interval_ms:
+                continue
+            next_process_ms = max(next_process_ms + process_interval_ms, ts)
+            ok, frame = cap.retrieve()
         if not ok:
             cap, cam_idx = switcher.next()
-            cfg["last_camera"]["index"] = cam_idx
-            config_loader.write_yaml(cfg_path, cfg)
+            remember_camera(cam_idx)
             continue
 
-        ts = int(time.time()*1000)
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        hands_list = tracker.detect(rgb, ts)
-        hands_map: Dict[str, HandState] = smoother.smoothe_dict({h.label: h for h in hands_list})
-        any_tracked = len(hands_map) > 0
-        if any_tracked: last_seen_ms = ts
-
-        # Get left/right hand for bindings
-        left_hand = hands_map.get('Left')
-        right_hand = hands_map.get('Right')
-
-        # Update all bindings
-        binding_index.update(left_hand, right_hand)
+        detector.submit(frame, ts)
+        # Bindings only step on a new detection result; in between the previous hands and
+        # debug drawing are kept, so a frame without a result never repeats a mouse move
+        result = detector.latest()
+        if result is not None:
+            hands_list, hands_ts = result
+            debug_overlay.clear()
+            # Left/right slots straight from the list (at most two hands; the last one per label wins)
+            left_hand = right_hand = None
+            for h in hands_list:
+                if h.label == 'Right':
+                    right_hand = h
+                elif h.label == 'Left':
+                    left_hand = h
+            any_tracked = left_hand is not None or right_hand is not None
+            if any_tracked: last_seen_ms = hands_ts
+
+            # Smoothed left/right hand for bindings
+            if left_hand is not None:
+                left_hand = smoother.smoothe('Left', left_hand)
+            if right_hand is not None:
+                right_hand = smoother.smoothe('Right', right_hand)
+
+            # Update all bindings
+            binding_index.update(left_hand, right_hand)
+            # One coalesced move/scroll per frame for everything the bindings emitted
+            mouse_out.flush()
+            debug_overlay.addHand(right_hand)
 
         # ---- Overlay ----
-        overlay_lines = []
-        overlay_lines.append(f"Cam [{cam_idx}]  ( [ / ] / TAB switch, r rescan )")
-        overlay_lines.append("ESC: quit   F9: calibrate (stub)")
-
-        # Debug overlay for each binding (per-binding debug key)
-        for i, binding in enumerate(binding_index.bindings):
-            # Try to get debug keys for this binding from config
-            binding_cfg = None
-            if hasattr(binding, 'id'):
-                # Find the config for this binding by id
-                for cfg_b in cfg.get('bindings', []):
-                    if cfg_b.get('id') == getattr(binding, 'id', None):
-                        binding_cfg = cfg_b
-                        break
-            debug_keys = set()
-            if binding_cfg and 'debug' in binding_cfg and isinstance(binding_cfg['debug'], list):
-                debug_keys = set(binding_cfg['debug'])
-            if debug_keys:
+        # Off: no probe_last() dicts, no putText and no debug rendering at all
+        if overlay_enabled:
+            overlay_lines = []
+            overlay_lines.append(f"Cam [{cam_idx}]  ( [ / ] / TAB switch, r rescan, o overlay )")
+            overlay_lines.append("ESC: quit   F9: calibrate (stub)")
+
+            # Debug overlay for each binding (per-binding debug key)
+            for i, binding, debug_keys in binding_debug:
                 probe = binding.probe_last()
                 line = f"{getattr(binding, 'id', f'binding_{i}')}: "
                 parts = []
-                def fmt(v):
-                    if isinstance(v, bool):
-                        return "1" if v else "0"
-                    if isinstance(v, float):
-                        sign = "+" if v >= 0 else ""
-                        return f"{sign}{v:.3f}"
-                    if isinstance(v, dict):
-                        return '{' + ', '.join(f"{kk}: {fmt(vv)}" for kk, vv in v.items()) + '}'
-                    if isinstance(v, list):
-                        return '[' + ', '.join(fmt(x) for x in v) + ']'
-                    return str(v)
-                for k in ['feature', 'gate', 'actuator', 'binding_state', 'binding_value', 'binding_time']:
+                for k in DEBUG_PROBE_KEYS:
                     if k in debug_keys:
                         val = probe.get(k, None)
-                        parts.append(f"{k}={fmt(val)}")
+                        parts.append(f"{k}={fmt_probe(val)}")
                 line += ", ".join(parts)
                 overlay_lines.append(line)
 
 
-        y0 = 24
-        for i, line in enumerate(overlay_lines):
-            cv2.putText(frame, line, (10, y0 + 22*i), font, 0.6, (0,255,255), 2, cv2.LINE_AA)
+            y0 = 24
+            for i, line in enumerate(overlay_lines):
+                text_overlay.draw(frame, line, (10, y0 + 22*i))
 
 
-        # ---- DebugOverlay rendering (3D points/lines/vectors) ----
-        debug_overlay.addHand(right_hand)
-        debug_overlay.render(frame)
+            # ---- DebugOverlay rendering (3D points/lines/vectors) ----
+            if debug_overlay.enabled:
+                debug_overlay.render(frame)
 
 
         cv2.imshow("Hand Mouse", frame)
@@ -254,15 +411,17 @@ def main():
         if key == 0x78:  # F9 (calibration stub)
             # TODO: wire calibration steps to update cfg["calibration"] and write_yaml(cfg_path, cfg)
             print("[info] Calibration UI not yet wired in this starter.")
+        if key & 0xFF in (ord('o'), ord('O')):
+            # The feature-side debug drawing follows the overlay (and the debug_overlay setting)
+            overlay_enabled = not overlay_enabled
+            debug_overlay.enabled = overlay_enabled and debug_overlay_cfg
+            debug_overlay.clear()
         # camera hotkeys
         cap, cam_idx = switcher.handle_key(key & 0xFF)
-        if cam_idx is not None and cfg["last_camera"].get("index") != cam_idx:
-            cfg["last_camera"]["index"] = cam_idx
-            config_loader.write_yaml(cfg_path, cfg)
-
-        # Clear debug overlay after rendering
-        debug_overlay.clear()
+        remember_camera(cam_idx)
 
+    detector.close()
+    cfg_writer.flush()
     if cap: cap.release()
     cv2.destroyAllWindows()
 
@@ -1,8 +1,25 @@
 
-from pynput.mouse import Controller as MouseController, Button
-from pynput.keyboard import Controller as KeyboardController, Key
+import re
+
 from .mouse import mouse_out
 
+# One keyboard controller shared by all keyboard actuators (like mouse_out for the mouse).
+# pynput's keyboard side is imported and connected on first use only, so configs
+# without keyboard bindings never pay for it
+_keyboard = None
+
+def _get_keyboard():
+    global _keyboard
+    if _keyboard is None:
+        from pynput.keyboard import Controller as KeyboardController
+        _keyboard = KeyboardController()
+    return _keyboard
+
+def _key(name):
+    # pynput Key member for special keys ('space', 'enter', ...), else the character itself
+    from pynput.keyboard import Key
+    return getattr(Key, name, name)
+
 # --- ActuatorPair for event actuators ---
 class ActuatorPair:
     def __init__(self, trigger_actuator, release_actuator=None):
@@ -109,7 +126,7 @@ class MouseButtonEventActuator(EventActuator):
 class KeyboardKeyEventActuator(EventActuator):
     def __init__(self, key, event):
         super().__init__((key, event))
-        self.keyboard = KeyboardController()
+        self.keyboard = _get_keyboard()
         self.key = key  # Key or str
         self.event = event  # 'down' or 'up'
     def trigger(self):
@@ -121,7 +138,7 @@ class KeyboardKeyEventActuator(EventActuator):
 class KeyboardDeltaActuator(DeltaActuator):
     def __init__(self, key):
         super().__init__(key)
-        self.keyboard = KeyboardController()
+        self.keyboard = _get_keyboard()
         self.key = key
     def trigger(self, value):
         import time
@@ -133,7 +150,7 @@ class KeyboardDeltaActuator(DeltaActuator):
 class KeyboardAbsActuator(AbsActuator):
     def __init__(self, key):
         super().__init__(key)
-        self.keyboard = KeyboardController()
+        self.keyboard = _get_keyboard()
         self.key = key
     def trigger(self, value):
         import time
@@ -141,13 +158,26 @@ class KeyboardAbsActuator(AbsActuator):
         self._last_value = value
         # Example: could be used for setting a value, e.g., brightness
         pass
-    def probe_last(self):
-        return {
-            'trigger': getattr(self.trigger_actuator, 'probe_last', lambda: None)(),
-            'release': getattr(self.release_actuator, 'probe_last', lambda: None)()
-        }
 
 # --- ActuatorBuilder ---
+# Literal keys -> factory; checked with one dict lookup before the pattern families below
+_BUILDERS = {
+    'mouse.move.x': lambda: MouseMoveDeltaActuator('x'),
+    'mouse.move.y': lambda: MouseMoveDeltaActuator('y'),
+    'mouse.scroll.x': lambda: MouseScrollDeltaActuator('x'),
+    'mouse.scroll.y': lambda: MouseScrollDeltaActuator('y'),
+    # Mouse abs (not implemented)
+    'mouse.pos.x': lambda: MouseAbsActuator('x'),
+    'mouse.pos.y': lambda: MouseAbsActuator('y'),
+}
+
+# mouse.click.<btn>.down|up, mouse.click.<btn>
+_MOUSE_CLICK_EVENT_RE = re.compile(r"mouse\.click\.(\w+)\.(down|up)$")
+_MOUSE_CLICK_RE = re.compile(r"mouse\.click\.(\w+)$")
+# key.<name>.down|up, key.<name>
+_KEY_EVENT_RE = re.compile(r"key\.([^.]+)\.(down|up)$")
+_KEY_RE = re.compile(r"key\.([^.]+)$")
+
 class ActuatorBuilder:
     @staticmethod
     def build(key, **kwargs):
@@ -159,59 +189,40 @@ class ActuatorBuilder:
             release_act = ActuatorBuilder.build(release) if release else None
             return ActuatorPair(trigger_act, release_act)
 
-        # Mouse move delta
-        if key == 'mouse.move.x':
-            return MouseMoveDeltaActuator('x')
-        if key == 'mouse.move.y':
-            return MouseMoveDeltaActuator('y')
-        # Mouse scroll delta
-        if key == 'mouse.scroll.x':
-            return MouseScrollDeltaActuator('x')
-        if key == 'mouse.scroll.y':
-            return MouseScrollDeltaActuator('y')
-        # Mouse button events (down/up)
-        import re
-        m_event = re.match(r"mouse\.click\.(\w+)\.(down|up)$", key)
-        if m_event:
-            btn = m_event.group(1)
-            action = m_event.group(2)
-            return MouseButtonEventActuator(btn, action)
+        factory = _BUILDERS.get(key)
+        if factory is not None:
+            return factory()
+        if not isinstance(key, str):
+            raise ValueError(f"Unknown actuator key: {key}")
 
+        # Mouse button events (down/up)
+        m = _MOUSE_CLICK_EVENT_RE.match(key)
+        if m:
+            return MouseButtonEventActuator(m.group(1), m.group(2))
         # Mouse button ActuatorPair for generic mouse.click.*
-        m_pair = re.match(r"mouse\.click\.(\w+)$", key)
-        if m_pair:
-            btn = m_pair.group(1)
+        m = _MOUSE_CLICK_RE.match(key)
+        if m:
+            btn = m.group(1)
             return ActuatorPair(
                 MouseButtonEventActuator(btn, 'down'),
                 MouseButtonEventActuator(btn, 'up')
             )
 
         # Keyboard key events (down/up)
-        if isinstance(key, str) and key.startswith('key.'):
-            parts = key.split('.')
-            # key.<name>.down or key.<name>.up
-            if len(parts) == 3:
-                keyname, event = parts[1], parts[2]
-                k = getattr(Key, keyname, keyname)
-                return KeyboardKeyEventActuator(k, event)
-            # key.<name> → ActuatorPair(key.<name>.down, key.<name>.up)
-            if len(parts) == 2:
-                keyname = parts[1]
-                k = getattr(Key, keyname, keyname)
-                return ActuatorPair(
-                    KeyboardKeyEventActuator(k, 'down'),
-                    KeyboardKeyEventActuator(k, 'up')
-                )
+        m = _KEY_EVENT_RE.match(key)
+        if m:
+            return KeyboardKeyEventActuator(_key(m.group(1)), m.group(2))
+        # key.<name> → ActuatorPair(key.<name>.down, key.<name>.up)
+        m = _KEY_RE.match(key)
+        if m:
+            k = _key(m.group(1))
+            return ActuatorPair(
+                KeyboardKeyEventActuator(k, 'down'),
+                KeyboardKeyEventActuator(k, 'up')
+            )
         # Keyboard delta/abs (custom, placeholder)
-        if isinstance(key, str) and key.startswith('key.delta.'):
-            keyname = key.split('.')[-1]
-            return KeyboardDeltaActuator(keyname)
-        if isinstance(key, str) and key.startswith('key.abs.'):
-            keyname = key.split('.')[-1]
-            return KeyboardAbsActuator(keyname)
-        # Mouse abs (not implemented)
-        if key == 'mouse.pos.x':
-            return MouseAbsActuator('x')
-        if key == 'mouse.pos.y':
-            return MouseAbsActuator('y')
-        raise ValueError(f"Unknown actuator key: {key}")
\ No newline at end of file
+        if key.startswith('key.delta.'):
+            return KeyboardDeltaActuator(key.split('.')[-1])
+        if key.startswith('key.abs.'):
+            return KeyboardAbsActuator(key.split('.')[-1])
+        raise ValueError(f"Unknown actuator key: {key}")
@@ -1,6 +1,11 @@
 # Mouse move/pos/scroll and buttons: platform-dependent backend
+import functools
 import sys
 import os
+import queue
+import struct
+import threading
+import time
 
 _PLATFORM = sys.platform
 
@@ -16,6 +21,19 @@ if _PLATFORM.startswith('win'):
     try:
         import ctypes
         from ctypes import wintypes
+
+        # Defined once: building ctypes Structure classes per event is costly
+        class _MOUSEINPUT(ctypes.Structure):
+            _fields_ = [("dx", wintypes.LONG), ("dy", wintypes.LONG), ("mouseData", wintypes.DWORD), ("dwFlags", wintypes.DWORD), ("time", wintypes.DWORD), ("dwExtraInfo", ctypes.POINTER(ctypes.c_ulong))]
+        class _INPUT(ctypes.Structure):
+            _fields_ = [("type", wintypes.DWORD), ("mi", _MOUSEINPUT)]
+
+        _SendInput = ctypes.windll.user32.SendInput
+        _SendInput.argtypes = (wintypes.UINT, ctypes.POINTER(_INPUT), ctypes.c_int)
+        _SendInput.restype = wintypes.UINT
+        _SIZEOF_INPUT = ctypes.sizeof(_INPUT)
+        # MOUSEEVENTF_* (down, up) flags per button
+        _BTN_FLAGS = {'left': (0x0002, 0x0004), 'right': (0x0008, 0x0010), 'middle': (0x0020, 0x0040)}
         _USE_SENDINPUT = True
     except Exception:
         _USE_SENDINPUT = False
@@ -26,6 +44,9 @@ if _PLATFORM.startswith('linux'):
         import uinput
         _UInputDevice = uinput.Device
         _UINPUT_EVENTS = [uinput.REL_X, uinput.REL_Y, uinput.BTN_LEFT, uinput.BTN_RIGHT, uinput.BTN_MIDDLE, uinput.REL_WHEEL]
+        # struct input_event (timeval, type, code, value); the kernel stamps uinput events itself
+        _INPUT_EVENT = struct.Struct('llHHi')
+        _SYN_REPORT = _INPUT_EVENT.pack(0, 0, 0, 0, 0)  # EV_SYN / SYN_REPORT
         _USE_UINPUT = True
     except ImportError:
         _USE_UINPUT = False
@@ -34,12 +55,21 @@ if _PLATFORM.startswith('linux'):
 if _PLATFORM == 'darwin':
     try:
         import Quartz
+        # Bound once: every Quartz.<name> lookup goes through the PyObjC bridge
         from Quartz.CoreGraphics import (
+            CGEventCreate, CGEventGetLocation, CGEventCreateScrollWheelEvent,
+            CGGetActiveDisplayList, CGDisplayBounds, CGMainDisplayID,
             CGEventCreateMouseEvent, CGEventPost, kCGHIDEventTap,
             kCGEventMouseMoved, kCGEventLeftMouseDown, kCGEventLeftMouseUp,
-            kCGEventRightMouseDown, kCGEventRightMouseUp,
+            kCGEventRightMouseDown, kCGEventRightMouseUp, kCGScrollEventUnitLine,
             kCGEventScrollWheel, kCGMouseButtonLeft, kCGMouseButtonRight
         )
+        # (CGMouseButton, down event, up event) per button
+        _QUARTZ_BUTTONS = {
+            'left': (kCGMouseButtonLeft, kCGEventLeftMouseDown, kCGEventLeftMouseUp),
+            'right': (kCGMouseButtonRight, kCGEventRightMouseDown, kCGEventRightMouseUp),
+        }
+        _QUARTZ_OTHER_BUTTON = (2, kCGEventRightMouseDown, kCGEventRightMouseUp)
         _USE_QUARTZ = True
     except Exception:
         _USE_QUARTZ = False
@@ -54,6 +84,12 @@ if not (_USE_SENDINPUT or _USE_UINPUT or _USE_QUARTZ):
 
 # --- Platform-specific MouseOut subclasses ---
 class SendInputMouseOut:
+    def __init__(self):
+        # One INPUT record reused for every event (SendInput copies it before returning)
+        self._inp = _INPUT(type=0)
+        self._inp_ref = ctypes.byref(self._inp)
+    def move(self, dx, dy):
+        self._sendinput_move(int(dx), int(dy))
     def move_dx(self, dx):
         self._sendinput_move(int(dx), 0)
     def move_dy(self, dy):
@@ -64,78 +100,112 @@ class SendInputMouseOut:
         self._sendinput_button(button, True)
     def up(self, button):
         self._sendinput_button(button, False)
+    def _send(self, dx, dy, data, flags):
+        mi = self._inp.mi
+        mi.dx = dx
+        mi.dy = dy
+        mi.mouseData = data
+        mi.dwFlags = flags
+        _SendInput(1, self._inp_ref, _SIZEOF_INPUT)
     def _sendinput_move(self, dx, dy):
-        import ctypes
-        from ctypes import wintypes
-        class MOUSEINPUT(ctypes.Structure):
-            _fields_ = [("dx", wintypes.LONG), ("dy", wintypes.LONG), ("mouseData", wintypes.DWORD), ("dwFlags", wintypes.DWORD), ("time", wintypes.DWORD), ("dwExtraInfo", ctypes.POINTER(ctypes.c_ulong))]
-        class INPUT(ctypes.Structure):
-            _fields_ = [("type", wintypes.DWORD), ("mi", MOUSEINPUT)]
         MOUSEEVENTF_MOVE = 0x0001
-        inp = INPUT(type=0, mi=MOUSEINPUT(dx, dy, 0, MOUSEEVENTF_MOVE, 0, None))
-        ctypes.windll.user32.SendInput(1, ctypes.byref(inp), ctypes.sizeof(inp))
+        self._send(dx, dy, 0, MOUSEEVENTF_MOVE)
     def _sendinput_button(self, button, down):
-        import ctypes
-        from ctypes import wintypes
-        class MOUSEINPUT(ctypes.Structure):
-            _fields_ = [("dx", wintypes.LONG), ("dy", wintypes.LONG), ("mouseData", wintypes.DWORD), ("dwFlags", wintypes.DWORD), ("time", wintypes.DWORD), ("dwExtraInfo", ctypes.POINTER(ctypes.c_ulong))]
-        class INPUT(ctypes.Structure):
-            _fields_ = [("type", wintypes.DWORD), ("mi", MOUSEINPUT)]
-        flags = 0
-        if button == 'left':
-            flags = 0x0002 if down else 0x0004
-        elif button == 'right':
-            flags = 0x0008 if down else 0x0010
-        else:
-            flags = 0x0020 if down else 0x0040
-        inp = INPUT(type=0, mi=MOUSEINPUT(0, 0, 0, flags, 0, None))
-        ctypes.windll.user32.SendInput(1, ctypes.byref(inp), ctypes.sizeof(inp))
+        # Anything but left/right is the middle button, as before
+        flags = _BTN_FLAGS.get(button, _BTN_FLAGS['middle'])[0 if down else 1]
+        self._send(0, 0, 0, flags)
     def _sendinput_scroll(self, dx, dy):
-        import ctypes
-        from ctypes import wintypes
-        class MOUSEINPUT(ctypes.Structure):
-            _fields_ = [("dx", wintypes.LONG), ("dy", wintypes.LONG), ("mouseData", wintypes.DWORD), ("dwFlags", wintypes.DWORD), ("time", wintypes.DWORD), ("dwExtraInfo", ctypes.POINTER(ctypes.c_ulong))]
-        class INPUT(ctypes.Structure):
-            _fields_ = [("type", wintypes.DWORD), ("mi", MOUSEINPUT)]
         if dy:
-            inp = INPUT(type=0, mi=MOUSEINPUT(0, 0, int(dy)*120, 0x0800, 0, None))
-            ctypes.windll.user32.SendInput(1, ctypes.byref(inp), ctypes.sizeof(inp))
+            self._send(0, 0, int(dy)*120, 0x0800)
         if dx:
-            inp = INPUT(type=0, mi=MOUSEINPUT(0, 0, int(dx)*120, 0x1000, 0, None))
-            ctypes.windll.user32.SendInput(1, ctypes.byref(inp), ctypes.sizeof(inp))
+            self._send(0, 0, int(dx)*120, 0x1000)
 
 class UInputMouseOut:
     def __init__(self):
         self.device = _UInputDevice(_UINPUT_EVENTS)
+        # python-uinput keeps the /dev/uinput fd private; with it, a frame's events plus the
+        # SYN go out as one write() instead of one emit() each. None: fall back to emit()
+        fd = getattr(self.device, '_Device__uinput_fd', None)
+        self._fd = fd if isinstance(fd, int) and fd >= 0 else None
+        self._hwheel = getattr(uinput, 'REL_HWHEEL', None)
+        # Anything but left/right is the middle button, as before
+        self._buttons = {'left': uinput.BTN_LEFT, 'right': uinput.BTN_RIGHT, 'middle': uinput.BTN_MIDDLE}
+    def _write(self, events):
+        # events: ((type, code), value) pairs, followed by one SYN_REPORT
+        if self._fd is None:
+            for ev, value in events:
+                self.device.emit(ev, value, syn=False)
+            self.device.syn()
+            return
+        pack = _INPUT_EVENT.pack
+        os.write(self._fd, b''.join([pack(0, 0, ev[0], ev[1], value) for ev, value in events]) + _SYN_REPORT)
+    def move(self, dx, dy):
+        events = []
+        if dx:
+            events.append((uinput.REL_X, int(dx)))
+        if dy:
+            events.append((uinput.REL_Y, int(dy)))
+        self._write(events)
     def move_dx(self, dx):
         self.device.emit(uinput.REL_X, int(dx), syn=False)
     def move_dy(self, dy):
         self.device.emit(uinput.REL_Y, int(dy), syn=False)
     def scroll(self, dx_ticks, dy_ticks):
-        if dx_ticks:
-            try:
-                self.device.emit(uinput.REL_HWHEEL, int(dx_ticks), syn=False)
-            except AttributeError:
-                pass
+        events = []
+        if dx_ticks and self._hwheel is not None:
+            events.append((self._hwheel, int(dx_ticks)))
         if dy_ticks:
-            self.device.emit(uinput.REL_WHEEL, int(dy_ticks), syn=False)
-        self.device.syn()
+            events.append((uinput.REL_WHEEL, int(dy_ticks)))
+        self._write(events)
     def down(self, button):
-        if button == 'left':
-            self.device.emit(uinput.BTN_LEFT, 1)
-        elif button == 'right':
-            self.device.emit(uinput.BTN_RIGHT, 1)
-        else:
-            self.device.emit(uinput.BTN_MIDDLE, 1)
+        self.device.emit(self._buttons.get(button, uinput.BTN_MIDDLE), 1)
     def up(self, button):
-        if button == 'left':
-            self.device.emit(uinput.BTN_LEFT, 0)
-        elif button == 'right':
-            self.device.emit(uinput.BTN_RIGHT, 0)
-        else:
-            self.device.emit(uinput.BTN_MIDDLE, 0)
+        self.device.emit(self._buttons.get(button, uinput.BTN_MIDDLE), 0)
 
 class QuartzMouseOut:
+    # The cursor position is tracked here instead of asked from the window server
+    # (CGEventCreate + CGEventGetLocation) on every event. The tracked position is
+    # clamped to the bounding box of the active displays, as the OS clamps the real
+    # cursor, so a move back from the edge takes effect at once, and a clamped move is
+    # followed by a resync. The position and the display bounds are also re-read every
+    # RESYNC_EVENTS events and after RESYNC_IDLE_S without events, which picks up
+    # physical mouse input and the edges between displays of different sizes inside
+    # the bounding box.
+    RESYNC_EVENTS = 60
+    RESYNC_IDLE_S = 0.25
+    MAX_DISPLAYS = 16
+
+    def __init__(self):
+        self._x = self._y = 0.0
+        self._bounds = (0.0, 0.0, 0.0, 0.0)
+        self._events = 0
+        self._t_last = 0.0
+        self._resync()
+    def _read_bounds(self):
+        # (min x, min y, max x, max y) of all active displays, in global display coordinates
+        try:
+            err, ids, count = CGGetActiveDisplayList(self.MAX_DISPLAYS, None, None)
+            ids = list(ids[:count]) if err == 0 and count else [CGMainDisplayID()]
+        except Exception:
+            ids = [CGMainDisplayID()]
+        rects = [CGDisplayBounds(d) for d in ids]
+        return (min(r.origin.x for r in rects), min(r.origin.y for r in rects),
+                max(r.origin.x + r.size.width for r in rects) - 1,
+                max(r.origin.y + r.size.height for r in rects) - 1)
+    def _resync(self):
+        loc = CGEventGetLocation(CGEventCreate(None))
+        self._x, self._y = loc.x, loc.y
+        self._bounds = self._read_bounds()
+        self._events = 0
+    def _location(self):
+        now = time.monotonic()
+        if self._events >= self.RESYNC_EVENTS or now - self._t_last > self.RESYNC_IDLE_S:
+            self._resync()
+        self._events += 1
+        self._t_last = now
+        return self._x, self._y
+    def move(self, dx, dy):
+        self._quartz_move(int(dx), int(dy))
     def move_dx(self, dx):
         self._quartz_move(int(dx), 0)
     def move_dy(self, dy):
@@ -147,22 +217,23 @@ class QuartzMouseOut:
     def up(self, button):
         self._quartz_button(button, False)
     def _quartz_move(self, dx, dy):
-        import Quartz
-        loc = Quartz.CGEventGetLocation(Quartz.CGEventCreate(None))
-        newx, newy = loc.x + dx, loc.y + dy
-        event = Quartz.CGEventCreateMouseEvent(None, Quartz.kCGEventMouseMoved, (newx, newy), Quartz.kCGMouseButtonLeft)
-        Quartz.CGEventPost(Quartz.kCGHIDEventTap, event)
+        x, y = self._location()
+        x0, y0, x1, y1 = self._bounds
+        nx = min(max(x + dx, x0), x1)
+        ny = min(max(y + dy, y0), y1)
+        if nx != x + dx or ny != y + dy:
+            self._events = self.RESYNC_EVENTS  # clamped: read the real position next event
+        self._x = x = nx
+        self._y = y = ny
+        CGEventPost(kCGHIDEventTap, CGEventCreateMouseEvent(None, kCGEventMouseMoved, (x, y), kCGMouseButtonLeft))
     def _quartz_button(self, button, down):
-        import Quartz
-        loc = Quartz.CGEventGetLocation(Quartz.CGEventCreate(None))
-        btn = Quartz.kCGMouseButtonLeft if button == 'left' else Quartz.kCGMouseButtonRight if button == 'right' else 2
-        event_type = (Quartz.kCGEventLeftMouseDown if down else Quartz.kCGEventLeftMouseUp) if button == 'left' else (Quartz.kCGEventRightMouseDown if down else Quartz.kCGEventRightMouseUp)
-        event = Quartz.CGEventCreateMouseEvent(None, event_type, (loc.x, loc.y), btn)
-        Quartz.CGEventPost(Quartz.kCGHIDEventTap, event)
+        x, y = self._location()
+        btn, down_type, up_type = _QUARTZ_BUTTONS.get(button, _QUARTZ_OTHER_BUTTON)
+        event = CGEventCreateMouseEvent(None, down_type if down else up_type, (x, y), btn)
+        CGEventPost(kCGHIDEventTap, event)
     def _quartz_scroll(self, dx, dy):
-        import Quartz
-        event = Quartz.CGEventCreateScrollWheelEvent(None, Quartz.kCGScrollEventUnitLine, 2, int(dy), int(dx))
-        Quartz.CGEventPost(Quartz.kCGHIDEventTap, event)
+        event = CGEventCreateScrollWheelEvent(None, kCGScrollEventUnitLine, 2, int(dy), int(dx))
+        CGEventPost(kCGHIDEventTap, event)
 
 class PynputMouseOut:
     def __init__(self):
@@ -172,6 +243,13 @@ class PynputMouseOut:
             'right': Button.right,
             'middle': Button.middle
         }
+        # press/release bound per button once; anything but left/right is the middle
+        # button, as in the other backends
+        press, release = self.mouse.press, self.mouse.release
+        self._down = {name: functools.partial(press, btn) for name, btn in self.buttons.items()}
+        self._up = {name: functools.partial(release, btn) for name, btn in self.buttons.items()}
+    def move(self, dx, dy):
+        self.mouse.move(int(dx), int(dy))
     def move_dx(self, dx):
         self.mouse.move(int(dx), 0)
     def move_dy(self, dy):
@@ -179,13 +257,23 @@ class PynputMouseOut:
     def scroll(self, dx_ticks, dy_ticks):
         self.mouse.scroll(int(dx_ticks), int(dy_ticks))
     def down(self, button):
-        self.mouse.press(self.buttons.get(button))
+        self._down.get(button, self._down['middle'])()
     def up(self, button):
-        self.mouse.release(self.buttons.get(button))
+        self._up.get(button, self._up['middle'])()
 
 # --- MouseOut factory/delegator ---
 class MouseOut:
-    def __init__(self):
+    """
+    Moves and scrolls are accumulated and sent by flush() (once per frame, from the main
+    loop): one backend call per channel instead of one per actuator and axis. Only whole
+    pixels/ticks are sent; the fractional rest carries over to the next flush, so small
+    deltas are no longer lost to int() truncation. Button events flush pending motion
+    first, so a click lands where the pointer was meant to be.
+    The backend calls themselves run on a writer thread (threaded=True): the frame loop
+    only enqueues, and never waits on SendInput/CGEventPost/uinput. Operations keep
+    their order; moves queued back to back while the writer was busy are summed.
+    """
+    def __init__(self, threaded: bool = True):
         if _USE_SENDINPUT:
             self._impl = SendInputMouseOut()
         elif _USE_UINPUT:
@@ -194,16 +282,70 @@ class MouseOut:
             self._impl = QuartzMouseOut()
         else:
             self._impl = PynputMouseOut()
+        self._pending_dx = 0.0
+        self._pending_dy = 0.0
+        self._pending_sx = 0.0
+        self._pending_sy = 0.0
+        self._queue = None
+        if threaded:
+            self._queue = queue.SimpleQueue()
+            threading.Thread(target=self._run, name="mouse-out", daemon=True).start()
+    def _send(self, op, *args):
+        if self._queue is None:
+            getattr(self._impl, op)(*args)
+        else:
+            self._queue.put((op, args))
+    def _run(self):
+        q = self._queue
+        while True:
+            batch = [q.get()]
+            while True:
+                try:
+                    batch.append(q.get_nowait())
+                except queue.Empty:
+                    break
+            # Sum runs of consecutive moves; scrolls and buttons stay in order between them
+            mdx = mdy = 0
+            for op, args in batch:
+                if op == 'move':
+                    mdx += args[0]
+                    mdy += args[1]
+                    continue
+                if mdx or mdy:
+                    self._call('move', (mdx, mdy))
+                    mdx = mdy = 0
+                self._call(op, args)
+            if mdx or mdy:
+                self._call('move', (mdx, mdy))
+    def _call(self, op, args):
+        try:
+            getattr(self._impl, op)(*args)
+        except Exception as e:
+            print(f"[mouse] {op} failed: {e}")
     def move_dx(self, dx):
-        self._impl.move_dx(dx)
+        self._pending_dx += dx
     def move_dy(self, dy):
-        self._impl.move_dy(dy)
+        self._pending_dy += dy
     def scroll(self, dx_ticks, dy_ticks):
-        self._impl.scroll(dx_ticks, dy_ticks)
+        self._pending_sx += dx_ticks
+        self._pending_sy += dy_ticks
+    def flush(self):
+        dx, dy = int(self._pending_dx), int(self._pending_dy)
+        if dx or dy:
+            self._pending_dx -= dx
+            self._pending_dy -= dy
+            self._send('move', dx, dy)
+        sx, sy = int(self._pending_sx), int(self._pending_sy)
+        if sx or sy:
+            self._pending_sx -= sx
+            self._pending_sy -= sy
+            self._send('scroll', sx, sy)
     def down(self, button):
-        self._impl.down(button)
+        self.flush()
+        self._send('down', button)
     def up(self, button):
-        self._impl.up(button)
+        self.flush()
+        self._send('up', button)
 
 
 def button_from_kind(kind: str):
@@ -2,116 +2,210 @@ import cv2
 import numpy as np
 
 from src.input.HandState import HandState
+from src.jit import HAS_NUMBA, njit
+
+class _RowBuffer:
+    # Preallocated float64 rows plus one BGR color per row, filled through a cursor:
+    # clear() only resets the cursor, capacity doubles when a frame needs more
+    __slots__ = ('data', 'colors', 'n')
+
+    def __init__(self, width, capacity=64):
+        self.data = np.empty((capacity, width), dtype=np.float64)
+        self.colors = np.empty((capacity, 3), dtype=np.int64)
+        self.n = 0
+
+    def append(self, values, color):
+        n = self.n
+        if n == len(self.data):
+            self.data = np.concatenate((self.data, np.empty_like(self.data)))
+            self.colors = np.concatenate((self.colors, np.empty_like(self.colors)))
+        self.data[n] = values
+        self.colors[n] = color
+        self.n = n + 1
+
+    def rows(self):
+        return self.data[:self.n]
+
+    def color_list(self):
+        return self.colors[:self.n].tolist()
+
+def _project_numpy(n, w, size):
+    # (3, N, 2) pixel coordinates in all three panes: image (normalized x, y), world x/y
+    # and world y/z, the world ones shifted into the side panels of the overlay
+    out = np.empty((3, n.shape[0], 2), dtype=np.int32)
+    out[0] = n[:, :2] * size
+    out[1] = (w[:, :2] + 0.25) * size
+    out[2] = (w[:, 1:] + 0.75) * size
+    return out
+
+@njit(['i4[:, :, :](f4[:, :], f4[:, :], f8[:])', 'i4[:, :, :](f8[:, :], f8[:, :], f8[:])'], cache=True)
+def _project_jit(n, w, size):
+    # Same panes as _project_numpy, each point read once for all three
+    # (offsets are added in float64, as the per-point code did before it was batched)
+    m = n.shape[0]
+    out = np.empty((3, m, 2), dtype=np.int32)
+    sw = size[0]
+    sh = size[1]
+    for i in range(m):
+        out[0, i, 0] = np.int32(n[i, 0] * sw)
+        out[0, i, 1] = np.int32(n[i, 1] * sh)
+        out[1, i, 0] = np.int32((w[i, 0] + 0.25) * sw)
+        out[1, i, 1] = np.int32((w[i, 1] + 0.25) * sh)
+        out[2, i, 0] = np.int32((w[i, 1] + 0.75) * sw)
+        out[2, i, 1] = np.int32((w[i, 2] + 0.75) * sh)
+    return out
+
+_project = _project_jit if HAS_NUMBA else _project_numpy
+
+# Hand skeleton segments drawn by addHand/render (landmark index pairs)
+_HAND_EDGES = np.array([
+    (HandState.WRIST, HandState.INDEX_FINGER_MCP),
+    (HandState.THUMB_CMC, HandState.INDEX_FINGER_MCP),
+    (HandState.INDEX_FINGER_MCP, HandState.MIDDLE_FINGER_MCP),
+    (HandState.MIDDLE_FINGER_MCP, HandState.RING_FINGER_MCP),
+    (HandState.RING_FINGER_MCP, HandState.PINKY_MCP),
+    (HandState.PINKY_MCP, HandState.WRIST),
+    (HandState.INDEX_FINGER_MCP, HandState.PINKY_MCP),
+    (HandState.WRIST, HandState.THUMB_CMC),
+    (HandState.THUMB_CMC, HandState.THUMB_MCP),
+    (HandState.THUMB_MCP, HandState.THUMB_IP),
+    (HandState.THUMB_IP, HandState.THUMB_TIP),
+    (HandState.INDEX_FINGER_MCP, HandState.INDEX_FINGER_PIP),
+    (HandState.INDEX_FINGER_PIP, HandState.INDEX_FINGER_DIP),
+    (HandState.INDEX_FINGER_DIP, HandState.INDEX_FINGER_TIP),
+    (HandState.MIDDLE_FINGER_MCP, HandState.MIDDLE_FINGER_PIP),
+    (HandState.MIDDLE_FINGER_PIP, HandState.MIDDLE_FINGER_DIP),
+    (HandState.MIDDLE_FINGER_DIP, HandState.MIDDLE_FINGER_TIP),
+    (HandState.RING_FINGER_MCP, HandState.RING_FINGER_PIP),
+    (HandState.RING_FINGER_PIP, HandState.RING_FINGER_DIP),
+    (HandState.RING_FINGER_DIP, HandState.RING_FINGER_TIP),
+    (HandState.PINKY_MCP, HandState.PINKY_PIP),
+    (HandState.PINKY_PIP, HandState.PINKY_DIP),
+    (HandState.PINKY_DIP, HandState.PINKY_TIP),
+], dtype=np.intp)
+
+def _xyz_from_attrs(v):
+    return (float(v.x), float(v.y), float(v.z))
+
+def _xyz_from_seq(v):
+    if len(v) != 3:
+        raise ValueError(f"Cannot convert {v} to (x, y, z)")
+    return (float(v[0]), float(v[1]), float(v[2]))
+
+def _xyz_from_array(v):
+    if v.shape != (3,):
+        raise ValueError(f"Cannot convert {v} to (x, y, z)")
+    return (float(v[0]), float(v[1]), float(v[2]))
+
+def _xyz_converter(v):
+    # Converter for values of type(v), probed once per type
+    # if hasattr(v, 'wx') and hasattr(v, 'wy') and hasattr(v, 'wz'):
+    #     return (float(v.wx), float(v.wy), float(v.wz))
+    if hasattr(v, 'x') and hasattr(v, 'y') and hasattr(v, 'z'):
+        return _xyz_from_attrs
+    if isinstance(v, (tuple, list)):
+        return _xyz_from_seq
+    if isinstance(v, np.ndarray):
+        return _xyz_from_array
+    raise ValueError(f"Cannot convert {v} to (x, y, z)")
 
 class DebugOverlay:
     """
     Collects 3D points, lines, and vectors for debug rendering. Use addPoint, addLine, addVector from anywhere.
     Call clear() after rendering to reset.
+    Callers on the per-frame path check `enabled` before building anything to draw;
+    while it is False the add* methods drop their input and render() draws nothing.
     """
-    def __init__(self):
-        self.points = []  # List of (x, y, z, color)
-        self.lines = []   # List of ((x1, y1, z1), (x2, y2, z2), color)
-        self.vectors = [] # List of ((x, y, z), (dx, dy, dz), color)
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.points = _RowBuffer(6)    # rows: normalized xyz, world xyz
+        self.lines = _RowBuffer(12)    # rows: both ends as normalized xyz, world xyz
+        self.vectors = _RowBuffer(6)   # rows: origin xyz, direction xyz
+        self.hands = []   # List of (nxyz, wxyz, color) from addHand
+        self._to_xyz_cache = {}  # type -> converter, see _to_xyz
 
     def _to_xyz(self, v):
-        # Accepts (x, y, z) tuple or NormalizedLandmark
-        # if hasattr(v, 'wx') and hasattr(v, 'wy') and hasattr(v, 'wz'):
-        #     return (float(v.wx), float(v.wy), float(v.wz))
-        if hasattr(v, 'x') and hasattr(v, 'y') and hasattr(v, 'z'):
-            return (float(v.x), float(v.y), float(v.z))
-        if isinstance(v, (tuple, list)) and len(v) == 3:
-            return (float(v[0]), float(v[1]), float(v[2]))
-        if isinstance(v, (np.ndarray)) and v.shape == (3,):
-            return (float(v[0]), float(v[1]), float(v[2]))
-        raise ValueError(f"Cannot convert {v} to (x, y, z)")
+        # Accepts (x, y, z) tuple or NormalizedLandmark; the way to read a type is worked
+        # out on its first value and then looked up by type
+        fn = self._to_xyz_cache.get(type(v))
+        if fn is None:
+            fn = self._to_xyz_cache[type(v)] = _xyz_converter(v)
+        return fn(v)
 
     def addPoint(self, p,  color=(0,255,0)):
-        # Accepts (x, y, z) or NormalizedLandmark as first arg
-        self.points.append((p, color))
+        # Accepts a landmark (anything with nTuple/wTuple); its coordinates are copied now
+        if not self.enabled:
+            return
+        self.points.append(p.nTuple() + p.wTuple(), color)
 
     def addLine(self, p1, p2, color=(255,0,0)):
-        self.lines.append((p1, p2, color))
+        if not self.enabled:
+            return
+        self.lines.append(p1.nTuple() + p1.wTuple() + p2.nTuple() + p2.wTuple(), color)
 
     def addVector(self, origin, direction, color=(0,0,255)):
         """origin: (x, y, z), direction: (dx, dy, dz)"""
         
+        if not self.enabled:
+            return
         origin = self._to_xyz(origin)
         direction = self._to_xyz(direction)
-        self.vectors.append((origin, direction, color))
+        self.vectors.append(origin + direction, color)
 
     def addHand(self, hand: HandState, color=(0,255,255)):
-        if hand is None:
+        # Drawn from the HandState arrays in render(), batched per view, instead of
+        # 22 points + 24 lines going through the per-element lists
+        if hand is None or not self.enabled:
             return
-        lms = hand.landmarks
-        for lm in lms:
-            self.addPoint(lm, color)
-
-        self.addLine(lms[HandState.WRIST], lms[HandState.INDEX_FINGER_MCP], color)
-        self.addLine(lms[HandState.THUMB_CMC], lms[HandState.INDEX_FINGER_MCP], color)
-        self.addLine(lms[HandState.INDEX_FINGER_MCP], lms[HandState.MIDDLE_FINGER_MCP], color)
-        self.addLine(lms[HandState.MIDDLE_FINGER_MCP], lms[HandState.RING_FINGER_MCP], color)
-        self.addLine(lms[HandState.RING_FINGER_MCP], lms[HandState.PINKY_MCP], color)
-        self.addLine(lms[HandState.PINKY_MCP], lms[HandState.WRIST], color)
-        self.addLine(lms[HandState.INDEX_FINGER_MCP], lms[HandState.PINKY_MCP], color)
-
-        self.addLine(lms[HandState.WRIST], lms[HandState.THUMB_CMC], color)
-        self.addLine(lms[HandState.THUMB_CMC], lms[HandState.THUMB_MCP], color)
-        self.addLine(lms[HandState.THUMB_MCP], lms[HandState.THUMB_IP], color)
-        self.addLine(lms[HandState.THUMB_IP], lms[HandState.THUMB_TIP], color)
-
-        self.addLine(lms[HandState.INDEX_FINGER_MCP], lms[HandState.INDEX_FINGER_PIP], color)
-        self.addLine(lms[HandState.INDEX_FINGER_PIP], lms[HandState.INDEX_FINGER_DIP], color)
-        self.addLine(lms[HandState.INDEX_FINGER_DIP], lms[HandState.INDEX_FINGER_TIP], color)
-
-        self.addLine(lms[HandState.MIDDLE_FINGER_MCP], lms[HandState.MIDDLE_FINGER_PIP], color)
-        self.addLine(lms[HandState.MIDDLE_FINGER_PIP], lms[HandState.MIDDLE_FINGER_DIP], color)
-        self.addLine(lms[HandState.MIDDLE_FINGER_DIP], lms[HandState.MIDDLE_FINGER_TIP], color)
-
-        self.addLine(lms[HandState.RING_FINGER_MCP], lms[HandState.RING_FINGER_PIP], color)
-        self.addLine(lms[HandState.RING_FINGER_PIP], lms[HandState.RING_FINGER_DIP], color)
-        self.addLine(lms[HandState.RING_FINGER_DIP], lms[HandState.RING_FINGER_TIP], color)
-
-        self.addLine(lms[HandState.PINKY_MCP], lms[HandState.PINKY_PIP], color)
-        self.addLine(lms[HandState.PINKY_PIP], lms[HandState.PINKY_DIP], color)
-        self.addLine(lms[HandState.PINKY_DIP], lms[HandState.PINKY_TIP], color)
+        self.hands.append((hand.nxyz, hand.wxyz, color))
 
     def clear(self):
-        self.points.clear()
-        self.lines.clear()
-        self.vectors.clear()
+        self.hands.clear()
+        self.points.n = 0
+        self.lines.n = 0
+        self.vectors.n = 0
 
     def render(self, frame):
         # Example: project 3D to 2D (requires camera intrinsics, here just drop z for demo)
-        for (p, color) in self.points:
-            x, y, z = p.nTuple()
-            cv2.circle(frame, (int(x * frame.shape[1]), int(y * frame.shape[0])), 6, color, -1)
-        for (p1, p2, color) in self.lines:
-            x1, y1, z1 = p1.nTuple()
-            x2, y2, z2 = p2.nTuple()
-            cv2.line(frame, (int(x1 * frame.shape[1]), int(y1 * frame.shape[0])), (int(x2 * frame.shape[1]), int(y2 * frame.shape[0])), color, 2)
-        for (origin, direction, color) in self.vectors:
-            x, y, z = origin
-            dx, dy, dz = direction
-            tip_x = x+dx 
-            tip_y = y+dy
-            cv2.arrowedLine(frame, (int(x * frame.shape[1]), int(y * frame.shape[0])), (int(tip_x * frame.shape[1]), int(tip_y * frame.shape[0])), color, 2, tipLength=0.2)
-
-
-        for (p, color) in self.points:
-            x, y, z = (p + (0.25, 0.25, 0.25)).wTuple()
-            cv2.circle(frame, (int(x * frame.shape[1]), int(y * frame.shape[0])), 6, color, -1)
-        for (p1, p2, color) in self.lines:
-            x1, y1, z1 = (p1 + (0.25, 0.25, 0.25)).wTuple()
-            x2, y2, z2 = (p2 + (0.25, 0.25, 0.25)).wTuple()
-            cv2.line(frame, (int(x1 * frame.shape[1]), int(y1 * frame.shape[0])), (int(x2 * frame.shape[1]), int(y2 * frame.shape[0])), color, 2)
-
-        for (p, color) in self.points:
-            x, y, z = (p + (0.75, 0.75, 0.75)).wTuple()
-            cv2.circle(frame, (int(y * frame.shape[1]), int(z * frame.shape[0])), 6, color, -1)
-        for (p1, p2, color) in self.lines:
-            x1, y1, z1 = (p1 + (0.75, 0.75, 0.75)).wTuple()
-            x2, y2, z2 = (p2 + (0.75, 0.75, 0.75)).wTuple()
-            cv2.line(frame, (int(y1 * frame.shape[1]), int(z1 * frame.shape[0])), (int(y2 * frame.shape[1]), int(z2 * frame.shape[0])), color, 2)
+        # Every hand, point and line end is projected into all three panes in one pass up
+        # front; the panes are then drawn in order, so only the draw calls stay per element
+        if not self.enabled:
+            return
+        size = np.array(frame.shape[1::-1], dtype=np.float64)  # (W, H)
+        hands = [(_project(nxyz, wxyz, size), color) for nxyz, wxyz, color in self.hands]
+        pt_colors = self.points.color_list()
+        if pt_colors:
+            pts = self.points.rows()
+            pts_px = _project(pts[:, :3], pts[:, 3:], size).tolist()
+        # Lines are drawn with one polylines call per color (first-added color first)
+        line_groups = {}
+        for i, color in enumerate(self.lines.color_list()):
+            line_groups.setdefault(tuple(color), []).append(i)
+        if line_groups:
+            ends = self.lines.rows().reshape(-1, 6)
+            ends_px = _project(ends[:, :3], ends[:, 3:], size).reshape(3, -1, 2, 2)
+        for view in range(3):
+            # Hands: 22 circles and one polylines call for the skeleton per hand
+            for px, color in hands:
+                ipts = px[view]
+                for x, y in ipts.tolist():
+                    cv2.circle(frame, (x, y), 6, color, -1)
+                cv2.polylines(frame, list(ipts[_HAND_EDGES]), False, color, 2)
+            if pt_colors:
+                for (x, y), color in zip(pts_px[view], pt_colors):
+                    cv2.circle(frame, (x, y), 6, color, -1)
+            if line_groups:
+                xy = ends_px[view]
+                for color, idx in line_groups.items():
+                    cv2.polylines(frame, list(xy[idx]), False, color, 2)
+            if view == 0 and self.vectors.n:
+                # Vectors only in the image pane
+                vec = self.vectors.rows()
+                base = vec[:, :2] * size
+                tip = (vec[:, :2] + vec[:, 3:5]) * size
+                for (x, y), (tx, ty), color in zip(base.astype(np.int32).tolist(),
+                                                   tip.astype(np.int32).tolist(), self.vectors.color_list()):
+                    cv2.arrowedLine(frame, (x, y), (tx, ty), color, 2, tipLength=0.2)
 
 
 # Global instance for universal access
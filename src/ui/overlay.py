@@ -1 +1,63 @@
-# On-screen overlay (values, gate states, hints) (placeholder)
+# On-screen overlay (values, gate states, hints)
+import cv2
+import numpy as np
+
+
+class TextOverlay:
+    """
+    cv2.putText with a raster cache for lines that repeat (help text, idle probe values):
+    a line drawn unchanged cache_after times is rasterised once into an anti-aliased mask,
+    later draws only blend the cached patch onto the frame (two saturating uint8 ops on
+    the text's bounding box instead of glyph rasterising). Rasterising costs several
+    putText calls, so lines whose text keeps changing (live probe values) are never
+    cached and are drawn with putText directly.
+    """
+    def __init__(self, font=cv2.FONT_HERSHEY_SIMPLEX, scale=0.6, color=(0, 255, 255),
+                 thickness=2, max_cached=256, cache_after=3):
+        self.font = font
+        self.scale = scale
+        self.color = color
+        self.thickness = thickness
+        self.max_cached = max_cached
+        self.cache_after = cache_after
+        self._cache = {}
+        self._seen = {}  # text -> times drawn while not cached yet
+
+    def _raster(self, text):
+        (w, h), baseline = cv2.getTextSize(text, self.font, self.scale, self.thickness)
+        pad = self.thickness + 1
+        mask = np.zeros((h + baseline + 2 * pad, w + 2 * pad), dtype=np.uint8)
+        cv2.putText(mask, text, (pad, h + pad), self.font, self.scale, 255, self.thickness, cv2.LINE_AA)
+        mask3 = cv2.merge((mask, mask, mask))
+        # frame * (1 - a) + color * a, with the color term premultiplied once here
+        inv_alpha = 255 - mask3
+        color = np.empty_like(mask3)
+        color[:] = self.color
+        color_term = cv2.multiply(color, mask3, scale=1.0 / 255.0)
+        # Patch top-left relative to the putText origin (bottom-left corner of the text)
+        return inv_alpha, color_term, -(h + pad), -pad
+
+    def draw(self, frame, text, org):
+        entry = self._cache.get(text)
+        if entry is None:
+            seen = self._seen.get(text, 0) + 1
+            if seen < self.cache_after or len(self._cache) >= self.max_cached:
+                # Not (yet) a repeating line, or the cache is full: plain putText
+                if len(self._seen) >= self.max_cached:
+                    self._seen.clear()  # drop the counts of one-off live values
+                self._seen[text] = seen
+                cv2.putText(frame, text, org, self.font, self.scale, self.color, self.thickness, cv2.LINE_AA)
+                return
+            self._seen.pop(text, None)
+            entry = self._cache[text] = self._raster(text)
+        inv_alpha, color_term, oy, ox = entry
+        y0, x0 = org[1] + oy, org[0] + ox
+        ph, pw = inv_alpha.shape[:2]
+        fh, fw = frame.shape[:2]
+        if y0 < 0 or x0 < 0 or y0 + ph > fh or x0 + pw > fw:
+            # Partly off-frame: let putText clip
+            cv2.putText(frame, text, org, self.font, self.scale, self.color, self.thickness, cv2.LINE_AA)
+            return
+        roi = frame[y0:y0 + ph, x0:x0 + pw]
+        cv2.multiply(roi, inv_alpha, dst=roi, scale=1.0 / 255.0)
+        cv2.add(roi, color_term, dst=roi)